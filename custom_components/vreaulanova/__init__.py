@@ -7,16 +7,35 @@ Licențiere: conform STANDARD-LICENTA.md v3.3 — server-side, Ed25519, grace pe
 import logging
 from dataclasses import dataclass, field
 
+from aiohttp import ClientSession, CookieJar, TCPConnector
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.components import persistent_notification
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import UpdateFailed
-
-from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL, DOMAIN_TOKEN_STORE, LICENSE_DATA_KEY, LICENSE_PURCHASE_URL, PLATFORMS
-from .api import NovaApiClient
+from homeassistant.util.ssl import get_default_context
+
+from .const import (
+    CONN_DNS_CACHE_TTL,
+    CONN_KEEPALIVE_TIMEOUT,
+    CONN_LIMIT_PER_HOST,
+    DOMAIN,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN_TOKEN_STORE,
+    LATENCY_STORAGE_KEY,
+    LATENCY_STORAGE_VERSION,
+    LICENSE_DATA_KEY,
+    LICENSE_PURCHASE_URL,
+    LIMITER_DATA_KEY,
+    PLATFORMS,
+    SESSION_STORAGE_KEY,
+    SESSION_STORAGE_VERSION,
+)
+from .api import AdaptiveLimiter, ConnectionStats, NovaApiClient
 from .coordinator import NovaCoordinator
 from .license import LicenseManager
 
@@ -298,16 +317,45 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     # Client API + Coordinator (un singur per cont)
     # ══════════════════════════════════════════════
 
-    session = async_get_clientsession(hass)
+    session, connection_stats = _create_session()
     username = entry.data["username"]
     password = entry.data["password"]
     update_interval = entry.data.get("update_interval", DEFAULT_UPDATE_INTERVAL)
+    use_graphql = entry.data.get("use_graphql", False)
+    use_hedging = entry.data.get("use_hedging", False)
 
     # Un singur client API (un singur cont, un singur token)
-    api_client = NovaApiClient(session, username, password)
+    # Limitatorul de concurență e comun tuturor intrărilor (același backend)
+    limiter = hass.data[DOMAIN].setdefault(LIMITER_DATA_KEY, AdaptiveLimiter())
+    api_client = NovaApiClient(
+        session,
+        username,
+        password,
+        use_graphql=use_graphql,
+        use_hedging=use_hedging,
+        limiter=limiter,
+        connection_stats=connection_stats,
+    )
+
+    async def _async_close_session(_event: Event) -> None:
+        await api_client.async_close()
+
+    # Sesiunea e creată de noi (nu de HA) — la oprirea HA o închidem explicit;
+    # la descărcarea intrării o închide async_unload_entry
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    )
+
+    # Un singur coordinator per cont
+    coordinator = NovaCoordinator(
+        hass,
+        api_client=api_client,
+        config_entry=entry,
+        update_interval=update_interval,
+    )
 
-    # Injectăm token-ul salvat — prioritate: hass.data (proaspăt, de la config_flow),
-    # apoi config_entry.data (persistent, pentru restart HA)
+    # Injectăm sesiunea salvată — prioritate: hass.data (proaspăt, de la config_flow),
+    # apoi snapshot-ul din Store (token + cookie-uri), apoi config_entry.data (legacy)
     token_store = hass.data.get(DOMAIN_TOKEN_STORE, {})
     stored_token = token_store.pop(username.lower(), None)
     if stored_token:
@@ -316,6 +364,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             "Token injectat din config_flow (proaspăt) pentru %s.",
             username,
         )
+    elif await coordinator.async_restore_session():
+        _LOGGER.debug(
+            "Sesiune restaurată din Store (token + cookie-uri) pentru %s.",
+            username,
+        )
     elif entry.data.get("token_data"):
         api_client.inject_token(entry.data["token_data"])
         _LOGGER.debug(
@@ -331,13 +384,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     if DOMAIN_TOKEN_STORE in hass.data and not hass.data[DOMAIN_TOKEN_STORE]:
         hass.data.pop(DOMAIN_TOKEN_STORE, None)
 
-    # Un singur coordinator per cont
-    coordinator = NovaCoordinator(
-        hass,
-        api_client=api_client,
-        config_entry=entry,
-        update_interval=update_interval,
-    )
+    # Timeout-urile adaptive pornesc din latențele învățate anterior
+    await coordinator.async_restore_latency()
 
     try:
         await coordinator.async_config_entry_first_refresh()
@@ -346,12 +394,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             "Prima actualizare eșuată (entry_id=%s): %s",
             entry.entry_id, err,
         )
+        await api_client.async_close()
         return False
     except Exception as err:
         _LOGGER.exception(
             "Eroare neașteptată la prima actualizare (entry_id=%s): %s",
             entry.entry_id, err,
         )
+        await api_client.async_close()
         return False
 
     # Salvăm datele runtime
@@ -360,6 +410,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         api_client=api_client,
     )
 
+    # Migrare: token_data din config_entry a trecut în Store-ul sesiunii
+    # (salvat de primul refresh). Rescrierea are loc o singură dată, înainte
+    # de înregistrarea listener-ului de opțiuni — nu declanșează reload.
+    if "token_data" in entry.data:
+        hass.config_entries.async_update_entry(
+            entry,
+            data={k: v for k, v in entry.data.items() if k != "token_data"},
+        )
+
+    # Token-ul se reînnoiește în fundal, înainte de expirare
+    coordinator.start_token_manager()
+
     # ── Încărcăm platformele NECONDIȚIONAT (gating-ul e în sensor.py) ──
     # Conform STANDARD-LICENTA.md §3.5
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -383,6 +445,32 @@ async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry):
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+def _create_session() -> tuple[ClientSession, ConnectionStats]:
+    """Sesiune HTTP dedicată unei intrări (cont Nova).
+
+    Pool propriu cu keep-alive și cache DNS, cookie jar izolat (payload-token
+    nu se amestecă cu alte integrări sau alte conturi) și TraceConfig pentru
+    rata de reutilizare a conexiunilor și fazele fiecărui request (dns,
+    connect, ttfb — vezi ConnectionStats).
+    """
+    connection_stats = ConnectionStats()
+    connector = TCPConnector(
+        ssl=get_default_context(),
+        limit_per_host=CONN_LIMIT_PER_HOST,
+        keepalive_timeout=CONN_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=CONN_DNS_CACHE_TTL,
+        enable_cleanup_closed=True,
+    )
+    session = ClientSession(
+        connector=connector,
+        cookie_jar=CookieJar(),
+        # Decomprimarea o face clientul — numără octeții de pe fir
+        auto_decompress=False,
+        trace_configs=[connection_stats.trace_config()],
+    )
+    return session, connection_stats
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Descărcarea intrării din config_entries."""
     _LOGGER.info(
@@ -396,6 +484,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if unload_ok:
         # runtime_data se curăță automat de HA la unload — nu facem pop manual
 
+        # Sesiunea HTTP dedicată intrării se închide odată cu ea
+        runtime = getattr(entry, "runtime_data", None)
+        if runtime and runtime.api_client:
+            await runtime.api_client.async_close()
+
         # Verifică dacă mai sunt entry-uri active
         remaining_entries = hass.config_entries.async_entries(DOMAIN)
         entry_ids_ramase = {e.entry_id for e in remaining_entries if e.entry_id != entry.entry_id}
@@ -458,6 +551,13 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
         entry.entry_id,
     )
 
+    # Latențele și snapshot-ul sesiunii aparțin acestei intrări
+    for version, key in (
+        (LATENCY_STORAGE_VERSION, LATENCY_STORAGE_KEY),
+        (SESSION_STORAGE_VERSION, SESSION_STORAGE_KEY),
+    ):
+        await Store(hass, version, key.format(entry_id=entry.entry_id)).async_remove()
+
     remaining = hass.config_entries.async_entries(DOMAIN)
     if not remaining:
         notify_data = hass.data.pop(f"{DOMAIN}_notify", None)
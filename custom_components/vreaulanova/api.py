@@ -5,41 +5,1455 @@ Toate endpoint-urile sunt validate cu răspunsuri reale.
 """
 
 import asyncio
+import base64
+import hashlib
+import json
 import logging
+import random
+import re
 import time
+import zlib
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import IntEnum, StrEnum
 from typing import Any
 
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import (
+    ClientConnectionError,
+    ClientConnectorError,
+    ClientPayloadError,
+    ClientSession,
+    ClientTimeout,
+    TraceConfig,
+)
+
+from yarl import URL
+
+try:
+    import orjson
+except ImportError:  # orjson vine cu Home Assistant; fallback pe stdlib
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli e opțional — fără el se negociază doar gzip/deflate
+    brotli = None
 
 from .const import (
     API_BASE,
+    API_FIELD_PROJECTIONS,
+    API_MAX_PAGES,
+    API_PAGE_SIZE,
     API_TIMEOUT,
+    AUTH_BACKOFF_BASE,
+    AUTH_BACKOFF_MAX,
+    AUTH_FAILURE_LIMIT,
+    BODY_MAX_BYTES,
+    BODY_MAX_BYTES_DEFAULT,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RECOVERY_TIMEOUT,
+    CONDITIONAL_CACHE_MAX_BYTES,
+    DECODE_EXECUTOR_THRESHOLD,
     HEADERS_BASE,
+    HEDGE_BUDGET_RATIO,
+    HEDGE_ENDPOINTS,
+    HEDGE_MIN_DELAY,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_WINDOW,
+    LIMITER_DECREASE_COOLDOWN,
+    LIMITER_INITIAL,
+    LIMITER_INTERACTIVE_HEADROOM,
+    LIMITER_LATENCY_TARGET,
+    LIMITER_MAX,
+    LIMITER_MIN,
+    RESPONSE_CACHE_GLOBAL,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_TTL,
+    RETRY_BASE_DELAY,
+    RETRY_ENDPOINT_ATTEMPTS,
+    RETRY_IDEMPOTENT_POSTS,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+    RETRY_STATUSES,
+    STREAM_CHUNK_SIZE,
+    TIMEOUT_CEILING,
+    TIMEOUT_FLOOR,
+    TIMEOUT_P99_MULTIPLIER,
+    TOKEN_MANAGER_MAX_SLEEP,
+    TOKEN_MANAGER_RETRY,
     TOKEN_MAX_AGE,
+    TOKEN_PROACTIVE_REFRESH,
     TOKEN_REFRESH_THRESHOLD,
+    TRACE_BUCKETS_MS,
+    TRACE_WINDOW,
+    TRANSFER_DAYS_KEPT,
     URL_APP_INFO,
     URL_BALANCES,
     URL_CONTRACTS,
     URL_CONTRACTS_DELIVERY,
+    URL_GRAPHQL,
     URL_INVOICES,
     URL_LOGIN,
     URL_ME,
     URL_METERING_POINTS,
     URL_METERING_POINTS_SELF_READINGS,
     URL_PAYMENTS,
+    URL_REFRESH_TOKEN,
     URL_SELF_READINGS,
     URL_SELF_READINGS_ADD,
     URL_SWITCH_ACCOUNT,
 )
 
 _LOGGER = logging.getLogger(__name__)
+# Linia structurată per refresh (faze request) — activată separat, la nivel debug
+_TRACE_LOGGER = logging.getLogger(f"{__name__}.trace")
+
+
+# GraphQL (Payload CMS) — alias bundle → numele query-ului generat de Payload
+_GRAPHQL_COLLECTIONS: dict[str, str] = {
+    "metering_points": "MeteringPoints",
+    "invoices": "Invoices",
+    "balances": "Balances",
+    "self_readings": "SelfReadings",
+    "contracts": "Contracts",
+    "payments": "Payments",
+}
+_GRAPHQL_LOGICAL = {"or": "OR", "and": "AND"}
+
+# Câmpurile cerute prin GraphQL — aceleași pe care le citesc coordinator-ul și senzorii
+_GRAPHQL_FIELDS: dict[str, str] = {
+    "metering_points": (
+        "meteringPointId number utilityType specificIdForUtilityType contractId "
+        "meters { series meterCode currentIndex unit dialCode } "
+        "gasRevisions { revisionType expirationDate executionDate }"
+    ),
+    # Ca în REST: fiecare doc e un wrapper {invoices[], balance}, nu o factură
+    "invoices": (
+        "invoices { invoiceId utilityType amountTotal amountToPay "
+        "dueDate issueDate status meteringPointCode } "
+        "balance { total prosumer } shouldPayAllBtnBeDisabled"
+    ),
+    "balances": "balance prosumerBalance",
+    "self_readings": (
+        "id updatedAt meterSeries lastSelfReadingDate "
+        "consumptionOldIndex consumptionNewIndex consumption"
+    ),
+    "contracts": (
+        "contractId number utilityType status type signedAt "
+        "inForceAt invoiceDeliveryType prosumerContract"
+    ),
+    "payments": "id updatedAt date totalAmount",
+}
+
+# Codările acceptate — decomprimarea e făcută de client (sesiunea dedicată
+# are auto_decompress=False), ca să putem număra octeții de pe fir
+_ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+
+# Erori de transport după care un request poate fi reîncercat
+_RETRY_EXCEPTIONS = (asyncio.TimeoutError, ClientConnectionError, ClientPayloadError)
+
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F-]{16,}|\d+)$")
+
+
+@dataclass
+class _RawResponse:
+    """Răspuns HTTP citit complet (status, headers, corp brut)."""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+
+@dataclass
+class _ValidatorEntry:
+    """Intrare în cache-ul condițional: validatori HTTP + corpul deja parsat."""
+
+    etag: str | None
+    last_modified: str | None
+    body_hash: str
+    data: Any
+    size: int  # octeți corp brut — aproximare pentru memoria ocupată
+
+
+class _ConditionalCache:
+    """Cache LRU pentru GET-uri condiționale, plafonat în octeți."""
+
+    def __init__(self, max_bytes: int = CONDITIONAL_CACHE_MAX_BYTES) -> None:
+        self._entries: OrderedDict[tuple, _ValidatorEntry] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self.not_modified = 0     # răspunsuri 304
+        self.unchanged_body = 0   # 200 cu același hash — decodare evitată
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> _ValidatorEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, entry: _ValidatorEntry) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        if entry.size > self._max_bytes:
+            return  # prea mare pentru cache — nu evacuăm totul pentru o intrare
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self._max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "not_modified": self.not_modified,
+            "unchanged_body": self.unchanged_body,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@dataclass
+class _TtlEntry:
+    """Intrare în cache-ul TTL."""
+
+    data: Any
+    size: int
+    expires_at: float  # time.monotonic()
+    endpoint: str
+    crm: str | None
+
+
+class ResponseCache:
+    """Cache de răspunsuri cu TTL per endpoint, per cont, LRU plafonat în octeți.
+
+    Interfața (get / put / invalidate / clear / stats) e tot ce folosește
+    NovaApiClient — o altă implementare poate fi injectată prin constructor.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES) -> None:
+        self._entries: OrderedDict[tuple, _TtlEntry] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        """(hit, date) — intrările expirate se elimină la citire."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry.data
+
+    def put(
+        self,
+        key: tuple,
+        data: Any,
+        size: int,
+        ttl: float,
+        *,
+        endpoint: str,
+        crm: str | None,
+    ) -> None:
+        self._remove(key)
+        if size > self._max_bytes:
+            return
+        self._entries[key] = _TtlEntry(
+            data=data,
+            size=size,
+            expires_at=time.monotonic() + ttl,
+            endpoint=endpoint,
+            crm=crm,
+        )
+        self._bytes += size
+        while self._bytes > self._max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, *, endpoint: str | None = None, crm: str | None = None) -> int:
+        """Elimină intrările pentru endpoint și/sau cont. Fără filtre → tot cache-ul."""
+        keys = [
+            key for key, entry in self._entries.items()
+            if (endpoint is None or entry.endpoint == endpoint)
+            and (crm is None or entry.crm == crm)
+        ]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+class ResultStatus(StrEnum):
+    """Rezultatul unui apel API, așa cum îl vede coordinator-ul."""
+
+    OK = "ok"                            # date noi
+    NOT_MODIFIED = "not_modified"        # 304 / cache — aceleași date ca înainte
+    EMPTY = "empty"                      # răspuns reușit, dar fără date (sau 404)
+    TRANSIENT_ERROR = "transient_error"  # rețea, timeout, 5xx, 429, circuit deschis
+    AUTH_ERROR = "auth_error"            # autentificare eșuată / 401 / 403
+
+
+@dataclass(slots=True)
+class ApiResult:
+    """Date + starea apelului (vezi NovaApiClient.async_call)."""
+
+    status: ResultStatus
+    data: Any = None
+    http_status: int | None = None  # statusul HTTP al unui răspuns de eroare
+
+    @property
+    def usable(self) -> bool:
+        """True dacă datele pot înlocui pe cele anterioare (inclusiv „gol”)."""
+        return self.status in (
+            ResultStatus.OK, ResultStatus.NOT_MODIFIED, ResultStatus.EMPTY
+        )
+
+
+class _CallOutcome:
+    """Stările tuturor request-urilor făcute în cadrul unui async_call."""
+
+    _SEVERITY = {
+        ResultStatus.NOT_MODIFIED: 0,
+        ResultStatus.EMPTY: 1,
+        ResultStatus.OK: 1,
+        ResultStatus.TRANSIENT_ERROR: 2,
+        ResultStatus.AUTH_ERROR: 3,
+    }
+
+    def __init__(self) -> None:
+        self.status: ResultStatus | None = None
+
+    def note(self, status: ResultStatus) -> None:
+        if self.status is None or self._SEVERITY[status] > self._SEVERITY[self.status]:
+            self.status = status
+
+
+# Colectorul apelului curent — setat de async_call, moștenit de task-urile copil
+_CALL_OUTCOME: ContextVar[_CallOutcome | None] = ContextVar(
+    "nova_call_outcome", default=None
+)
+
+
+def _note_outcome(status: ResultStatus) -> None:
+    outcome = _CALL_OUTCOME.get()
+    if outcome is not None:
+        outcome.note(status)
+
+
+def _status_result(status: int) -> ApiResult:
+    """Status HTTP de eroare → ApiResult."""
+    if status in (401, 403):
+        return ApiResult(ResultStatus.AUTH_ERROR, http_status=status)
+    if status == 404:
+        return ApiResult(ResultStatus.EMPTY, http_status=status)
+    return ApiResult(ResultStatus.TRANSIENT_ERROR, http_status=status)
+
+
+def _is_empty(data: Any) -> bool:
+    if data is None:
+        return True
+    if isinstance(data, dict):
+        docs = data.get("docs", data.get("invoices"))
+        return not data or (isinstance(docs, list) and not docs)
+    return isinstance(data, list) and not data
+
+
+class ResponseTooLargeError(Exception):
+    """Corpul răspunsului depășește limita configurată pentru endpoint."""
+
+
+class CircuitOpenError(Exception):
+    """Request refuzat local — circuit breaker deschis (backend indisponibil)."""
+
+
+class CircuitBreaker:
+    """Circuit breaker closed → open → half-open pentru backend-ul Nova.
+
+    closed:    request-urile trec; eșecurile consecutive se numără.
+    open:      după `failure_threshold` eșecuri, request-urile sunt refuzate
+               imediat (fără timeout de 30 s) timp de `recovery_timeout` secunde.
+    half_open: trece un singur request de probă; succes → closed, eșec → open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout: float = BREAKER_RECOVERY_TIMEOUT,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """closed / open / half_open (open expirat = gata de probă)."""
+        if (
+            self._state == "open"
+            and time.monotonic() - self._opened_at >= self._recovery_timeout
+        ):
+            return "half_open"
+        return self._state
+
+    def allow_request(self) -> bool:
+        """True dacă request-ul poate pleca (în half-open: doar proba)."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probe_in_flight:
+            self._state = "half_open"
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self._state != "closed":
+            _LOGGER.info("Circuit breaker închis — backend-ul Nova răspunde din nou")
+        self._state = "closed"
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        if self._state == "half_open":
+            self._trip()
+            return
+        self._failures += 1
+        if self._state == "closed" and self._failures >= self._failure_threshold:
+            self._trip()
+
+    def release_probe(self) -> None:
+        """Proba a fost anulată fără rezultat — permite o nouă probă."""
+        self._probe_in_flight = False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+    def _trip(self) -> None:
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self.trips += 1
+        _LOGGER.warning(
+            "Circuit breaker deschis după %d eșecuri — request-urile către Nova "
+            "sunt refuzate %d s",
+            self._failures, self._recovery_timeout,
+        )
+
+
+class RequestPriority(IntEnum):
+    """Clasa de prioritate a unui request (valoare mai mică = servit mai întâi)."""
+
+    INTERACTIVE = 0   # acțiuni pornite de utilizator (ex: trimitere index)
+    REFRESH = 1       # refresh-ul periodic al coordinator-ului
+    BACKFILL = 2      # reîncercări țintite, pre-încălzire
+
+
+# Prioritatea request-urilor din contextul curent (moștenită de task-urile copil)
+_PRIORITY: ContextVar[RequestPriority] = ContextVar(
+    "nova_request_priority", default=RequestPriority.REFRESH
+)
+
+
+@dataclass
+class _SharedFlight:
+    """Prioritatea unui GET coalesced — a celui mai prioritar apelant.
+
+    Task-ul comun pornește cu prioritatea primului apelant; un apelant mai
+    prioritar care se alătură o ridică, inclusiv pentru locurile deja
+    așteptate în limitator (waiters).
+    """
+
+    priority: RequestPriority
+    waiters: set[asyncio.Future] = field(default_factory=set)
+
+
+# GET-ul coalesced din care face parte request-ul curent (None = necoalesced)
+_FLIGHT: ContextVar[_SharedFlight | None] = ContextVar("nova_shared_flight", default=None)
+
+
+class AdaptiveLimiter:
+    """Limitator de concurență AIMD, partajat de toate intrările integrării.
+
+    Fereastra (numărul maxim de request-uri simultane) crește aditiv cât timp
+    latențele rămân sub țintă (+1 request per fereastră completă) și se
+    înjumătățește la timeout sau 429. Request-urile peste fereastră așteaptă
+    în coadă — întâi clasa de prioritate, apoi ordinea sosirii. Request-urile
+    interactive au LIMITER_INTERACTIVE_HEADROOM locuri peste fereastră, ca să
+    nu aștepte după GET-urile de fundal aflate deja în zbor.
+    """
+
+    def __init__(
+        self,
+        initial: int = LIMITER_INITIAL,
+        min_limit: int = LIMITER_MIN,
+        max_limit: int = LIMITER_MAX,
+        latency_target: float = LIMITER_LATENCY_TARGET,
+    ) -> None:
+        self._limit = float(initial)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_target = latency_target
+        self._in_flight = 0
+        self._waiters: dict[RequestPriority, deque[asyncio.Future]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self._last_decrease = 0.0
+        self.max_queue_depth = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Fereastra curentă (request-uri simultane permise)."""
+        return max(self._min_limit, int(self._limit))
+
+    async def acquire(
+        self,
+        priority: RequestPriority = RequestPriority.REFRESH,
+        flight: _SharedFlight | None = None,
+    ) -> None:
+        """Așteaptă un loc în fereastră (clasele mai prioritare trec înainte).
+
+        Cu `flight`, locul așteptat poate fi promovat ulterior (vezi promote).
+        """
+        if self._in_flight < self._capacity(priority) and not any(
+            self._waiters[p] for p in RequestPriority if p <= priority
+        ):
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        if flight is not None:
+            flight.waiters.add(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            queue = self._queue_of(waiter)
+            if queue is not None:
+                queue.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # Locul ne-a fost deja cedat — îl eliberăm pentru următorul
+                self.release()
+            raise
+        finally:
+            if flight is not None:
+                flight.waiters.discard(waiter)
+
+    def promote(self, flight: _SharedFlight) -> None:
+        """Mută locurile așteptate de `flight` în coada priorității sale curente."""
+        target = self._waiters[flight.priority]
+        for waiter in flight.waiters:
+            queue = self._queue_of(waiter)
+            if queue is not None and queue is not target:
+                queue.remove(waiter)
+                target.append(waiter)
+        self._wake()
+
+    def release(self) -> None:
+        """Eliberează locul și trezește următorii din coadă."""
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake()
+
+    def on_success(self, latency: float) -> None:
+        """Răspuns sănătos: creștere aditivă dacă latența e sub țintă."""
+        if latency <= self._latency_target and self._limit < self._max_limit:
+            self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+            self._wake()
+
+    def on_congestion(self) -> None:
+        """Timeout / 429: fereastra se înjumătățește (cel mult o dată per cooldown)."""
+        now = time.monotonic()
+        if now - self._last_decrease < LIMITER_DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self._min_limit), self._limit / 2)
+        self.decreases += 1
+        _LOGGER.debug("Limitator API: fereastra redusă la %d", self.limit)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._waiters.values())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "window": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "queue_depth_by_priority": {
+                priority.name.lower(): len(queue)
+                for priority, queue in self._waiters.items()
+            },
+            "max_queue_depth": self.max_queue_depth,
+            "decreases": self.decreases,
+        }
+
+    def _queue_of(self, waiter: asyncio.Future) -> deque[asyncio.Future] | None:
+        for queue in self._waiters.values():
+            if waiter in queue:
+                return queue
+        return None
+
+    def _capacity(self, priority: RequestPriority) -> int:
+        if priority is RequestPriority.INTERACTIVE:
+            return self.limit + LIMITER_INTERACTIVE_HEADROOM
+        return self.limit
+
+    def _wake(self) -> None:
+        for priority in RequestPriority:
+            queue = self._waiters[priority]
+            while queue and self._in_flight < self._capacity(priority):
+                waiter = queue.popleft()
+                if waiter.done():
+                    continue
+                self._in_flight += 1
+                waiter.set_result(None)
+            if queue:
+                return  # clasele mai puțin prioritare așteaptă după aceasta
+
+
+class RequestDispatcher:
+    """Dispecer cu priorități pentru request-urile unui client.
+
+    Fiecare request trece prin limitator cu prioritatea din contextul curent
+    (vezi NovaApiClient.account_gate); timpul de așteptare în coadă se
+    înregistrează per clasă. Poarta de cont serializează secvențele care
+    comută contul vizualizat pe server (refresh, reîncercare, buton): un
+    deținător mai puțin prioritar o cedează în puncte sigure (checkpoint),
+    între două conturi, dacă o clasă mai prioritară așteaptă. Un GET
+    coalesced rulează cu prioritatea celui mai prioritar apelant (promote).
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter) -> None:
+        self._limiter = limiter
+        self._waits: dict[RequestPriority, deque[float]] = {
+            priority: deque(maxlen=LATENCY_WINDOW) for priority in RequestPriority
+        }
+        self._requests: dict[RequestPriority, int] = dict.fromkeys(RequestPriority, 0)
+        self._gate_holder: RequestPriority | None = None
+        self._gate_waiters: dict[RequestPriority, deque[asyncio.Future]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self.preemptions = 0
+        self.promotions = 0
+        self.paused_seconds = 0.0
+
+    async def acquire(self) -> None:
+        """Ocupă un loc în limitator cu prioritatea contextului curent."""
+        flight = _FLIGHT.get()
+        priority = flight.priority if flight is not None else _PRIORITY.get()
+        started = time.monotonic()
+        await self._limiter.acquire(priority, flight)
+        if flight is not None:
+            priority = flight.priority  # eventual promovat cât a așteptat
+        self._waits[priority].append(time.monotonic() - started)
+        self._requests[priority] += 1
+
+    def promote(self, flight: _SharedFlight, priority: RequestPriority) -> None:
+        """Un apelant mai prioritar s-a alăturat GET-ului coalesced."""
+        if priority >= flight.priority:
+            return
+        flight.priority = priority
+        self.promotions += 1
+        self._limiter.promote(flight)
+
+    def release(self) -> None:
+        self._limiter.release()
+
+    async def acquire_gate(self, priority: RequestPriority) -> None:
+        """Așteaptă poarta de cont (clasele mai prioritare trec înainte)."""
+        if self._gate_holder is None and not any(self._gate_waiters.values()):
+            self._gate_holder = priority
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._gate_waiters[priority]
+        queue.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in queue:
+                queue.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                self.release_gate()
+            raise
+
+    def release_gate(self) -> None:
+        """Cedează poarta următorului din coadă, în ordinea priorității."""
+        self._gate_holder = None
+        for priority in RequestPriority:
+            queue = self._gate_waiters[priority]
+            while queue:
+                waiter = queue.popleft()
+                if waiter.done():
+                    continue
+                self._gate_holder = priority
+                waiter.set_result(None)
+                return
+
+    async def checkpoint(self) -> None:
+        """Punct sigur: cedează poarta dacă o clasă mai prioritară o așteaptă."""
+        holder = self._gate_holder
+        if holder is None or not any(
+            self._gate_waiters[p] for p in RequestPriority if p < holder
+        ):
+            return
+        self.preemptions += 1
+        started = time.monotonic()
+        _LOGGER.debug("Poarta de cont cedată unui request mai prioritar (%s)", holder.name)
+        self.release_gate()
+        await self.acquire_gate(holder)
+        self.paused_seconds += time.monotonic() - started
+
+    def stats(self) -> dict[str, Any]:
+        waits: dict[str, dict[str, Any]] = {}
+        for priority, samples in self._waits.items():
+            ordered = sorted(samples)
+            waits[priority.name.lower()] = {
+                "requests": self._requests[priority],
+                "wait_avg_ms": round(sum(ordered) / len(ordered) * 1000, 1)
+                if ordered else None,
+                "wait_p95_ms": round(
+                    ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 1
+                ) if ordered else None,
+                "wait_max_ms": round(ordered[-1] * 1000, 1) if ordered else None,
+            }
+        return {
+            "queue_wait": waits,
+            "gate_holder": self._gate_holder.name.lower() if self._gate_holder else None,
+            "gate_waiting": {
+                priority.name.lower(): len(queue)
+                for priority, queue in self._gate_waiters.items()
+            },
+            "preemptions": self.preemptions,
+            "promotions": self.promotions,
+            "paused_seconds": round(self.paused_seconds, 2),
+        }
+
+
+class LatencyTracker:
+    """Fereastră glisantă de latențe (secunde) per endpoint, pentru percentile."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        samples = self._samples.get(endpoint)
+        if samples is None:
+            samples = self._samples[endpoint] = deque(maxlen=self._window)
+        samples.append(seconds)
+
+    def percentile(
+        self, endpoint: str, quantile: float, min_samples: int = LATENCY_MIN_SAMPLES
+    ) -> float | None:
+        """Percentila cerută sau None dacă nu avem destule eșantioane."""
+        samples = self._samples.get(endpoint)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def export(self) -> dict[str, list[float]]:
+        """Eșantioanele curente, serializabile (pentru persistență)."""
+        return {
+            endpoint: [round(value, 4) for value in samples]
+            for endpoint, samples in self._samples.items()
+        }
+
+    def restore(self, data: Mapping[str, Any]) -> None:
+        """Reîncarcă eșantioane salvate anterior (valorile invalide se ignoră)."""
+        for endpoint, values in data.items():
+            if not isinstance(values, list):
+                continue
+            for value in values[-self._window:]:
+                if isinstance(value, (int, float)) and value > 0:
+                    self.record(endpoint, float(value))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            endpoint: {
+                "samples": len(samples),
+                "p50": self.percentile(endpoint, 0.5, 1),
+                "p95": self.percentile(endpoint, 0.95, 1),
+                "p99": self.percentile(endpoint, 0.99, 1),
+            }
+            for endpoint, samples in self._samples.items()
+        }
+
+
+class ConnectionStats:
+    """Instrumentarea sesiunii dedicate (via aiohttp TraceConfig).
+
+    Numără conexiunile noi vs. reutilizate și măsoară fazele fiecărui
+    request, etichetate cu endpoint-ul și CRM-ul (trace_request_ctx):
+      - pool:     așteptare după o conexiune liberă în pool;
+      - dns:      rezolvarea numelui (doar la cache miss);
+      - connect:  TCP + TLS pentru o conexiune nouă (aiohttp nu le separă);
+      - ttfb:     de la trimiterea header-elor la primirea răspunsului;
+      - transfer: citirea corpului (măsurată de client);
+      - decode:   decodarea JSON (măsurată de client).
+    Fazele se păstrează într-o fereastră glisantă (TRACE_WINDOW) și se
+    agregă la cerere în histograme (TRACE_BUCKETS_MS) și percentile.
+    """
+
+    PHASES = ("pool", "dns", "connect", "ttfb", "transfer", "decode")
+
+    def __init__(self, window: int = TRACE_WINDOW) -> None:
+        self.created = 0
+        self.reused = 0
+        self.prewarmed = 0
+        self._handshakes: deque[float] = deque(maxlen=window)
+        # Per fază: (endpoint, crm, secunde)
+        self._samples: dict[str, deque[tuple[str, str, float]]] = {
+            phase: deque(maxlen=window) for phase in self.PHASES
+        }
+        self._cycle: dict[str, list[float]] = {}
+        self._cycle_requests = 0
+        self._cycle_slowest: tuple[float, str, str] | None = None
+
+    def trace_config(self) -> TraceConfig:
+        """TraceConfig de atașat la ClientSession(trace_configs=[...])."""
+        trace = TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_connection_queued_start.append(self._on_queued_start)
+        trace.on_connection_queued_end.append(self._on_queued_end)
+        trace.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace.on_connection_create_start.append(self._on_create_start)
+        trace.on_connection_create_end.append(self._on_create_end)
+        trace.on_connection_reuseconn.append(self._on_reuse)
+        trace.on_request_headers_sent.append(self._on_headers_sent)
+        trace.on_request_end.append(self._on_request_end)
+        return trace
+
+    @staticmethod
+    def _mark(ctx, phase: str, seconds: float) -> None:
+        """Scrie faza în dict-ul per request primit prin trace_request_ctx."""
+        timings = getattr(ctx, "trace_request_ctx", None)
+        if isinstance(timings, dict):
+            timings[phase] = timings.get(phase, 0.0) + seconds
+
+    async def _on_request_start(self, _session, ctx, _params) -> None:
+        ctx.request_started = time.monotonic()
+
+    async def _on_queued_start(self, _session, ctx, _params) -> None:
+        ctx.queued_started = time.monotonic()
+
+    async def _on_queued_end(self, _session, ctx, _params) -> None:
+        self._mark(ctx, "pool", time.monotonic() - ctx.queued_started)
+
+    async def _on_dns_start(self, _session, ctx, _params) -> None:
+        ctx.dns_started = time.monotonic()
+
+    async def _on_dns_end(self, _session, ctx, _params) -> None:
+        ctx.dns_seconds = time.monotonic() - ctx.dns_started
+        self._mark(ctx, "dns", ctx.dns_seconds)
+
+    async def _on_create_start(self, _session, ctx, _params) -> None:
+        ctx.connect_started = time.monotonic()
+        ctx.dns_seconds = 0.0
+
+    async def _on_create_end(self, _session, ctx, _params) -> None:
+        self.created += 1
+        started = getattr(ctx, "connect_started", None)
+        if started is not None:
+            handshake = time.monotonic() - started
+            self._handshakes.append(handshake)
+            # Rezolvarea DNS are loc în interiorul creării conexiunii
+            self._mark(ctx, "connect", max(0.0, handshake - ctx.dns_seconds))
+
+    async def _on_reuse(self, _session, _ctx, _params) -> None:
+        self.reused += 1
+
+    async def _on_headers_sent(self, _session, ctx, _params) -> None:
+        ctx.headers_sent = time.monotonic()
+
+    async def _on_request_end(self, _session, ctx, _params) -> None:
+        started = getattr(ctx, "headers_sent", None) or getattr(ctx, "request_started", None)
+        if started is not None:
+            self._mark(ctx, "ttfb", time.monotonic() - started)
+
+    def record(self, endpoint: str, crm: str | None, timings: Mapping[str, float]) -> None:
+        """Înregistrează fazele unui request (sau doar decode, separat)."""
+        crm = crm or ""
+        for phase, seconds in timings.items():
+            if phase not in self._samples:
+                continue
+            self._samples[phase].append((endpoint, crm, seconds))
+            totals = self._cycle.setdefault(phase, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+        if "ttfb" in timings:
+            # Request HTTP complet (decode vine separat, după)
+            self._cycle_requests += 1
+            total = sum(v for k, v in timings.items() if k != "decode")
+            if self._cycle_slowest is None or total > self._cycle_slowest[0]:
+                self._cycle_slowest = (total, endpoint, crm)
+
+    def start_cycle(self) -> None:
+        """Resetează totalurile per refresh (linia structurată din cycle_summary)."""
+        self._cycle = {}
+        self._cycle_requests = 0
+        self._cycle_slowest = None
+
+    def cycle_summary(self) -> dict[str, Any]:
+        """Totaluri per fază pentru refresh-ul curent."""
+        summary: dict[str, Any] = {
+            "requests": self._cycle_requests,
+            "phases": {
+                phase: {
+                    "count": int(count),
+                    "total_ms": round(total * 1000, 1),
+                    "max_ms": round(peak * 1000, 1),
+                }
+                for phase, (count, total, peak) in self._cycle.items()
+            },
+        }
+        if self._cycle_slowest:
+            total, endpoint, crm = self._cycle_slowest
+            summary["slowest"] = {
+                "endpoint": endpoint, "crm": crm, "total_ms": round(total * 1000, 1)
+            }
+        return summary
+
+    @staticmethod
+    def _summarize(values: list[float]) -> dict[str, Any]:
+        ordered = sorted(values)
+        count = len(ordered)
+        return {
+            "count": count,
+            "p50_ms": round(ordered[count // 2] * 1000, 1),
+            "p95_ms": round(ordered[min(count - 1, int(0.95 * count))] * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+    @staticmethod
+    def _histogram(values: list[float]) -> dict[str, int]:
+        buckets = dict.fromkeys([f"<={b}ms" for b in TRACE_BUCKETS_MS], 0)
+        overflow = 0
+        for value in values:
+            ms = value * 1000
+            for bound in TRACE_BUCKETS_MS:
+                if ms <= bound:
+                    buckets[f"<={bound}ms"] += 1
+                    break
+            else:
+                overflow += 1
+        buckets[f">{TRACE_BUCKETS_MS[-1]}ms"] = overflow
+        return buckets
+
+    def phase_stats(self) -> dict[str, Any]:
+        """Histograme + percentile per fază, pe endpoint și pe CRM."""
+        result: dict[str, Any] = {}
+        for phase, samples in self._samples.items():
+            if not samples:
+                continue
+            by_endpoint: dict[str, list[float]] = {}
+            by_crm: dict[str, list[float]] = {}
+            for endpoint, crm, seconds in samples:
+                by_endpoint.setdefault(endpoint, []).append(seconds)
+                by_crm.setdefault(crm or "-", []).append(seconds)
+            values = [seconds for _endpoint, _crm, seconds in samples]
+            result[phase] = {
+                **self._summarize(values),
+                "histogram": self._histogram(values),
+                "by_endpoint": {
+                    key: self._summarize(vals) for key, vals in sorted(by_endpoint.items())
+                },
+                "by_crm": {key: self._summarize(vals) for key, vals in sorted(by_crm.items())},
+            }
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        total = self.created + self.reused
+        handshakes = list(self._handshakes)
+        return {
+            "connections_created": self.created,
+            "connections_reused": self.reused,
+            "reuse_rate": round(self.reused / total, 3) if total else None,
+            "handshake_avg_ms": (
+                round(sum(handshakes) / len(handshakes) * 1000, 1) if handshakes else None
+            ),
+            "handshake_max_ms": round(max(handshakes) * 1000, 1) if handshakes else None,
+            "prewarmed": self.prewarmed,
+        }
+
+
+class _DocsStreamParser:
+    """Scanner incremental pentru răspunsurile paginate Payload CMS.
+
+    Primește corpul pe bucăți și delimitează documentele din docs[] pe rând,
+    pe măsură ce sunt complete: întoarce octeții JSON ai fiecărui document,
+    decodarea rămâne la apelant (decodorul comun al clientului). Corpul întreg
+    nu e ținut niciodată în memorie. Metadatele paginării (hasNextPage,
+    nextPage etc.) se obțin după close(), tot ca octeți JSON. Acceptă și o
+    listă simplă la nivel superior (endpoint nepaginat).
+    """
+
+    _DOCS_START = re.compile(rb'"docs"\s*:\s*\[')
+    _STRUCTURAL = re.compile(rb'["{}\[\]]')
+    _STRING_SPECIAL = re.compile(rb'["\\]')
+    _SCALAR_END = re.compile(rb'[\s,\]]')
+    _PREFIX_MAX = 64 * 1024
+
+    def __init__(self) -> None:
+        self._buffer = b""
+        self._prefix = b""
+        self._state = "prefix"
+        self._is_list = False
+        # Scanarea documentului curent — se reia de aici la bucata următoare
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Adaugă o bucată; returnează documentele (octeți JSON) completate de ea."""
+        self._buffer += chunk
+        docs: list[bytes] = []
+        if self._state == "prefix":
+            stripped = self._buffer.lstrip()
+            if stripped.startswith(b"["):
+                self._is_list = True
+                self._buffer = stripped[1:]
+                self._state = "items"
+            else:
+                match = self._DOCS_START.search(self._buffer)
+                if match is None:
+                    if len(self._buffer) > self._PREFIX_MAX:
+                        raise ValueError("răspuns fără docs[] la început")
+                    return docs
+                self._prefix = self._buffer[: match.start()]
+                self._buffer = self._buffer[match.end():]
+                self._state = "items"
+
+        while self._state == "items":
+            doc = self._next_doc()
+            if doc is None:
+                break  # document incomplet — așteptăm următoarea bucată
+            docs.append(doc)
+        return docs
+
+    def _next_doc(self) -> bytes | None:
+        """Următorul document complet din buffer, sau None."""
+        if self._pos == 0:
+            self._buffer = self._buffer.lstrip(b" \t\r\n,")
+            first = self._buffer[:1]
+            if not first:
+                return None
+            if first == b"]":
+                self._buffer = self._buffer[1:]
+                self._state = "after"
+                return None
+            if first == b'"':
+                self._in_string = True
+                self._pos = 1
+            elif first not in (b"{", b"["):
+                # Valoare simplă (număr / literal) — se termină la separator
+                match = self._SCALAR_END.search(self._buffer)
+                return self._take(match.start()) if match else None
+
+        buf = self._buffer
+        pos = self._pos
+        while True:
+            if self._in_string:
+                match = self._STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    self._pos = len(buf)
+                    return None
+                if buf[match.start()] == 0x5C:  # \ — caracterul următor e escapat
+                    if match.end() >= len(buf):
+                        self._pos = match.start()
+                        return None
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                if self._depth == 0:
+                    return self._take(pos)
+                continue
+            match = self._STRUCTURAL.search(buf, pos)
+            if match is None:
+                self._pos = len(buf)
+                return None
+            char = buf[match.start()]
+            pos = match.end()
+            if char == 0x22:  # "
+                self._in_string = True
+            elif char in (0x7B, 0x5B):  # { [
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._take(pos)
+
+    def _take(self, end: int) -> bytes:
+        doc = self._buffer[:end]
+        self._buffer = self._buffer[end:]
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        return doc
+
+    def close(self) -> bytes:
+        """Finalizează scanarea; returnează metadatele (JSON cu docs gol)."""
+        if self._state != "after":
+            raise ValueError("răspuns JSON trunchiat")
+        if self._is_list:
+            return b"{}"
+        return self._prefix + b'"docs":[]' + self._buffer
+
+
+class _BodyDecompressor:
+    """Decomprimare incrementală după Content-Encoding (gzip / deflate / br)."""
+
+    def __init__(self, encoding: str) -> None:
+        encoding = encoding.strip().lower()
+        self._brotli = None
+        self._zlib = None
+        if encoding in ("gzip", "x-gzip", "deflate"):
+            # 32 + MAX_WBITS: detectează automat antetul gzip sau zlib
+            self._zlib = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        elif encoding == "br" and brotli is not None:
+            self._brotli = brotli.Decompressor()
+        elif encoding not in ("", "identity"):
+            raise ValueError(f"Content-Encoding nesuportat: {encoding}")
+
+    def decompress(self, chunk: bytes) -> bytes:
+        if self._zlib is not None:
+            return self._zlib.decompress(chunk)
+        if self._brotli is not None:
+            return self._brotli.process(chunk)
+        return chunk
+
+    def flush(self) -> bytes:
+        if self._zlib is not None:
+            return self._zlib.flush()
+        return b""
+
+
+def _ensure_json(content_type: str | None, endpoint: str) -> None:
+    """Respinge răspunsurile 200 care nu sunt JSON (ex: pagini HTML de eroare)."""
+    if content_type and "json" not in content_type.lower():
+        raise ValueError(f"{endpoint}: Content-Type neașteptat {content_type!r}")
+
+
+def _json_loads(body: bytes) -> Any:
+    """Decodor JSON implicit: orjson dacă e instalat, altfel stdlib."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _endpoint_key(url: str) -> str:
+    """Cheia endpoint-ului: calea relativă la API_BASE, cu ID-urile înlocuite.
+
+    https://.../api/metering-points/<uuid>/consumption-agreements
+        → /metering-points/{id}/consumption-agreements
+    """
+    path = url[len(API_BASE):] if url.startswith(API_BASE) else url
+    path = path.split("?", 1)[0]
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Backoff exponențial cu full jitter: uniform(0, min(max, base · 2^(n-1)))."""
+    ceiling = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Retry-After: secunde sau dată HTTP → secunde de așteptat (None dacă lipsește)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _parse_http_date(value: str | None) -> float | None:
+    """Antet HTTP Date → epoch (None dacă lipsește sau e invalid)."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _jwt_exp(token: str | None) -> float | None:
+    """Câmpul exp din payload-ul JWT (decodat local, fără verificarea semnăturii)."""
+    if not token or token.count(".") != 2:
+        return None
+    segment = token.split(".")[1]
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+    except (ValueError, TypeError):
+        return None
+    exp = payload.get("exp") if isinstance(payload, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def _account_ref(account: dict | None) -> dict | None:
+    """Referința minimă a unui cont (pentru persistare și switch)."""
+    if not isinstance(account, dict):
+        return None
+    return {
+        key: account.get(key, "")
+        for key in ("accountName", "accountNumber", "accountId")
+    }
+
+
+def _projection_honoured(data: Any, fields: tuple[str, ...]) -> bool:
+    """Verifică dacă răspunsul conține măcar unul dintre câmpurile proiectate."""
+    docs = data.get("docs") if isinstance(data, dict) else data
+    if not isinstance(docs, list) or not docs:
+        return True  # nimic de verificat (colecție goală / alt format)
+    first = docs[0]
+    return isinstance(first, dict) and any(f in first for f in fields)
+
+
+def _build_where_params(where: dict, prefix: str = "where") -> dict[str, str]:
+    """Aplatizează o clauză where Payload în parametri query-string.
+
+    {"updatedAt": {"greater_than": "2025-01-01"}}
+        → {"where[updatedAt][greater_than]": "2025-01-01"}
+    {"or": [{"a": {"equals": 1}}, {"b": {"in": ["x", "y"]}}]}
+        → {"where[or][0][a][equals]": "1", "where[or][1][b][in]": "x,y"}
+    """
+    params: dict[str, str] = {}
+    for key, value in where.items():
+        path = f"{prefix}[{key}]"
+        if isinstance(value, dict):
+            params.update(_build_where_params(value, path))
+        elif isinstance(value, (list, tuple)):
+            if key in ("and", "or"):
+                for i, clause in enumerate(value):
+                    params.update(_build_where_params(clause, f"{path}[{i}]"))
+            else:
+                # in / not_in / all → listă separată prin virgulă
+                params[path] = ",".join(str(v) for v in value)
+        elif isinstance(value, bool):
+            params[path] = "true" if value else "false"
+        else:
+            params[path] = str(value)
+    return params
+
+
+def _combine_where(*clauses: dict | None) -> dict | None:
+    """Combină mai multe clauze where cu AND (ignoră clauzele goale)."""
+    present = [c for c in clauses if c]
+    if not present:
+        return None
+    if len(present) == 1:
+        return present[0]
+    return {"and": present}
+
+
+def _delta_where(updated_after: str | None) -> dict | None:
+    """Filtru Payload pentru sincronizare delta (doar documente modificate)."""
+    if not updated_after:
+        return None
+    return {"updatedAt": {"greater_than": updated_after}}
+
+
+def _payments_archive_where(year: int | None) -> dict | None:
+    """Plățile din anul dat."""
+    if year is None:
+        return None
+    return {"date": {"greater_than_equal": f"{year}-01-01"}}
+
+
+def _query_params(
+    params: dict | None,
+    where: dict | None,
+    sort: str | None,
+    limit: int | None,
+) -> dict | None:
+    """Parametrii query-string ai unui GET, cu clauzele Payload adăugate."""
+    if not where and not sort and limit is None:
+        return params
+    query = dict(params or {})
+    if where:
+        query.update(_build_where_params(where))
+    if sort:
+        query["sort"] = sort
+    if limit is not None:
+        query["limit"] = limit
+    return query
+
+
+def _graphql_literal(value: Any) -> str:
+    """Convertește o valoare Python (ex: clauză where) în literal GraphQL.
+
+    Operatorii logici Payload sunt majusculi în GraphQL (or → OR, and → AND).
+    """
+    if isinstance(value, dict):
+        items = ", ".join(
+            f"{_GRAPHQL_LOGICAL.get(key, key)}: {_graphql_literal(item)}"
+            for key, item in value.items()
+        )
+        return "{" + items + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_graphql_literal(item) for item in value) + "]"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _graphql_schema_error(errors: Any) -> bool:
+    """True dacă erorile GraphQL arată o interogare invalidă pentru schemă."""
+    if not isinstance(errors, list):
+        return False
+    for error in errors:
+        if not isinstance(error, dict):
+            continue
+        code = (error.get("extensions") or {}).get("code")
+        message = str(error.get("message", ""))
+        if code == "GRAPHQL_VALIDATION_FAILED" or "Cannot query field" in message:
+            return True
+    return False
+
+
+def _graphql_error_message(errors: Any) -> str:
+    """Primul mesaj de eroare GraphQL (pentru log)."""
+    if isinstance(errors, list) and errors and isinstance(errors[0], dict):
+        return str(errors[0].get("message", "fără date"))
+    return "fără date"
+
+
+def _latency_key(endpoint: str, params: Mapping[str, Any] | None) -> str:
+    """Cheia latențelor: citirile delta (where[...][updatedAt]) au cheie proprie.
+
+    Răspunsurile delta sunt mici — amestecate cu descărcările complete ar
+    coborî timeout-ul adaptiv sub durata unei descărcări complete.
+    """
+    if params and any(
+        key.startswith("where[") and "[updatedAt]" in key for key in params
+    ):
+        return f"{endpoint}#delta"
+    return endpoint
+
+
+def _hedge_lost(status: int) -> bool:
+    """Status care nu câștigă cursa de hedging (5xx / 429 — reîncercabil)."""
+    return status in RETRY_STATUSES or status >= 500
+
+
+def _merge_invoice_wrappers(docs: list[Any]) -> dict | None:
+    """Wrapper-ele /invoices → unul singur (facturile paginilor următoare adăugate)."""
+    wrapper: dict | None = None
+    for doc in docs:
+        if not isinstance(doc, dict):
+            continue
+        if wrapper is None:
+            wrapper = dict(doc)  # copie — nu mutăm documentul original
+            wrapper["invoices"] = list(doc.get("invoices", []) or [])
+        else:
+            wrapper["invoices"].extend(doc.get("invoices", []) or [])
+    return wrapper
+
+
+def _graphql_selection(
+    collection: str, fields: str, where: dict | None = None, sort: str | None = None
+) -> str:
+    """Selecția GraphQL pentru o colecție, cu alias = cheia din bundle."""
+    args = [f"limit: {API_PAGE_SIZE * API_MAX_PAGES}"]
+    if where:
+        args.append(f"where: {_graphql_literal(where)}")
+    if sort:
+        args.append(f"sort: {_graphql_literal(sort)}")
+    return (
+        f"{collection}: {_GRAPHQL_COLLECTIONS[collection]}({', '.join(args)}) "
+        f"{{ docs {{ {fields} }} hasNextPage }}"
+    )
 
 
 class NovaApiClient:
     """Client API pentru Nova Power & Gas (Payload CMS backend)."""
 
-    def __init__(self, session: ClientSession, email: str, password: str) -> None:
+    def __init__(
+        self,
+        session: ClientSession,
+        email: str,
+        password: str,
+        use_graphql: bool = False,
+        use_hedging: bool = False,
+        response_cache: ResponseCache | None = None,
+        limiter: AdaptiveLimiter | None = None,
+        connection_stats: ConnectionStats | None = None,
+        json_loads: Callable[[bytes], Any] | None = None,
+    ) -> None:
         self._session = session
+        # Decodor JSON (înlocuibil) + statistici de decodare per endpoint
+        self._json_loads = json_loads or _json_loads
+        self._decode_stats: dict[str, dict[str, float]] = {}
+        # Octeți transferați: per endpoint, per refresh (curent / anterior), per zi
+        self._transfer_stats: dict[str, dict[str, int]] = {}
+        self._cycle_bytes: dict[str, int] = {"wire_bytes": 0, "body_bytes": 0}
+        self._last_cycle_bytes: dict[str, int] | None = None
+        self._daily_bytes: dict[str, dict[str, int]] = {}
+        # Statistici de pool — doar pentru sesiunea dedicată (cu TraceConfig)
+        self._connection_stats = connection_stats
         self._email = email
         self._password = password
 
@@ -47,7 +1461,45 @@ class NovaApiClient:
         self._access_token: str | None = None
         self._token_obtained_at: float = 0.0
         self._token_expires_in: int = TOKEN_MAX_AGE
-        self._auth_lock = asyncio.Lock()
+        # Diferența ceas server − ceas local (secunde), din antetul Date
+        self._clock_skew: float = 0.0
+        self._proactive_refreshes = 0
+        # Refresh-token Payload CMS: None = netestat, False = endpoint absent
+        self._refresh_supported: bool | None = None
+        self._token_refreshes = 0
+        self._password_logins = 0
+        # 401/403 → re-autentificare + replay; eșecuri repetate → pauză
+        self._auth_failures = 0
+        self._auth_blocked_until = 0.0
+        self._auth_replays = 0
+        # Ultimul login respins de server pentru credențiale (400/401/403) —
+        # doar acestea intră în backoff, nu indisponibilitatea backend-ului
+        self._login_rejected = False
+        # Contul asociat pe care e comutată sesiunea (None = contul principal)
+        self._switched_account: dict | None = None
+        # Single-flight: un singur login în zbor, oricâți apelanți
+        self._login_task: asyncio.Task | None = None
+        # Single-flight: GET-uri identice în zbor (cheie → task comun + prioritate)
+        self._inflight: dict[tuple, tuple[asyncio.Task, _SharedFlight]] = {}
+        self._coalesced_count = 0
+
+        # Reîncercări efectuate, per endpoint (instrumentare)
+        self._retry_counts: dict[str, int] = {}
+
+        # Circuit breaker pentru backend.nova-energy.ro
+        self._breaker = CircuitBreaker()
+
+        # Limitator de concurență — partajat între intrări dacă e furnizat
+        self._limiter = limiter or AdaptiveLimiter()
+        # Dispecer cu priorități (interactive > refresh > backfill) + poarta de cont
+        self._dispatcher = RequestDispatcher(self._limiter)
+
+        # Latențe observate + hedging (opțional — GET-uri din HEDGE_ENDPOINTS)
+        self._latency = LatencyTracker()
+        self._use_hedging = use_hedging
+        self._hedge_eligible = 0
+        self._hedges_fired = 0
+        self._hedges_won = 0
 
         # Date cont din login — endpoint-ul /accounts/login/client returnează:
         #   data.loggedInAccount  — contul principal (cu associatedAccounts[])
@@ -66,6 +1518,21 @@ class NovaApiClient:
 
         self._timeout = ClientTimeout(total=API_TIMEOUT)
 
+        # Endpoint-uri la care backend-ul a respins proiecția de câmpuri
+        self._projection_disabled: set[str] = set()
+        # Endpoint-uri la care backend-ul a respins filtrele where (400)
+        self._where_disabled: set[str] = set()
+
+        # Cache GET condițional (ETag / Last-Modified / hash corp)
+        self._conditional_cache = _ConditionalCache()
+
+        # Cache TTL pentru date care se schimbă rar (app-info, contracte, convenții)
+        self._response_cache = response_cache or ResponseCache()
+
+        # GraphQL — opțional; None = suport încă nedetectat
+        self._use_graphql = use_graphql
+        self._graphql_supported: bool | None = None
+
     # ──────────────────────────────────────────
     # Proprietăți
     # ──────────────────────────────────────────
@@ -77,7 +1544,7 @@ class NovaApiClient:
 
     @property
     def crm_viewed_account(self) -> str | None:
-        """CRM-ul contului vizualizat (poate fi subcont)."""
+        """CRM-ul contului vizualizat pe server (subcont după async_switch_account)."""
         return self._crm_viewed
 
     @property
@@ -120,6 +1587,21 @@ class NovaApiClient:
         """Nova nu folosește MFA — mereu None."""
         return self._mfa_data
 
+    @property
+    def circuit_state(self) -> str:
+        """Starea circuit breaker-ului: closed / open / half_open."""
+        return self._breaker.state
+
+    @property
+    def retry_counts(self) -> dict[str, int]:
+        """Reîncercări efectuate per endpoint (de la crearea clientului)."""
+        return dict(self._retry_counts)
+
+    @property
+    def graphql_enabled(self) -> bool:
+        """GraphQL e activat din opțiuni și nu a fost respins de backend."""
+        return self._use_graphql and self._graphql_supported is not False
+
     @property
     def has_token(self) -> bool:
         return self._access_token is not None
@@ -131,6 +1613,82 @@ class NovaApiClient:
         age = time.monotonic() - self._token_obtained_at
         return age < (self._token_expires_in - TOKEN_REFRESH_THRESHOLD)
 
+    def _set_token_expiry(self, fallback_exp: Any, date_header: str | None) -> None:
+        """Marchează token-ul curent ca proaspăt și calculează durata de viață.
+
+        Sursa expirării: exp din JWT (decodat local), apoi fallback_exp din
+        răspuns — ambele în ceasul serverului, corectat cu antetul Date.
+        """
+        self._token_obtained_at = time.monotonic()
+        self._update_clock_skew(date_header)
+        expire_at = _jwt_exp(self._access_token)
+        if expire_at is None and isinstance(fallback_exp, (int, float)) and fallback_exp:
+            expire_at = float(fallback_exp)
+        if expire_at is not None:
+            server_now = time.time() + self._clock_skew
+            self._token_expires_in = int(expire_at - server_now)
+        else:
+            self._token_expires_in = TOKEN_MAX_AGE
+
+    def token_seconds_left(self) -> float:
+        """Secunde până la expirarea token-ului (0 dacă nu există token)."""
+        if not self._access_token:
+            return 0.0
+        return self._token_expires_in - (time.monotonic() - self._token_obtained_at)
+
+    def _update_clock_skew(self, date_header: str | None) -> None:
+        """Corectează diferența de ceas față de server din antetul Date."""
+        server_time = _parse_http_date(date_header)
+        if server_time is not None:
+            self._clock_skew = server_time - time.time()
+
+    async def async_run_token_manager(
+        self, on_refresh: Callable[[], None] | None = None
+    ) -> None:
+        """Buclă de fundal: reînnoiește token-ul înainte să expire.
+
+        Login-ul pornește cu TOKEN_PROACTIVE_REFRESH secunde înainte de
+        expirare — mai devreme decât pragul din is_token_valid — așa că
+        refresh-urile coordinator-ului găsesc mereu un token valid și nu
+        așteaptă niciodată după login. La eșec se reîncearcă după
+        TOKEN_MANAGER_RETRY. Rulează până la anulare (descărcarea intrării).
+
+        Reînnoirea ține poarta de cont: fallback-ul pe login cu parola mută
+        serverul pe contul principal până la re-comutare, deci nu poate
+        rula în mijlocul citirii unui cont asociat. Cât timp autentificarea
+        e suspendată (backoff după eșecuri repetate), bucla doar așteaptă.
+
+        on_refresh: apelat după fiecare reînnoire reușită (persistare).
+        """
+        retry_delay = TOKEN_MANAGER_RETRY
+        while True:
+            blocked_for = self._auth_blocked_until - time.monotonic()
+            if blocked_for > 0:
+                await asyncio.sleep(min(blocked_for, TOKEN_MANAGER_MAX_SLEEP))
+                continue
+            delay = self.token_seconds_left() - TOKEN_PROACTIVE_REFRESH
+            if delay > 0:
+                await asyncio.sleep(min(delay, TOKEN_MANAGER_MAX_SLEEP))
+                continue
+            async with self.account_gate(RequestPriority.REFRESH):
+                # Token-ul poate fi fost reînnoit cât am așteptat poarta
+                if (
+                    self.token_seconds_left() > TOKEN_PROACTIVE_REFRESH
+                    or time.monotonic() < self._auth_blocked_until
+                ):
+                    continue
+                _LOGGER.debug("Token Nova aproape de expirare — reînnoire în fundal")
+                renewed = await self.async_renew_token()
+            if renewed:
+                self._proactive_refreshes += 1
+                retry_delay = TOKEN_MANAGER_RETRY
+                if on_refresh is not None:
+                    on_refresh()
+            else:
+                # Eșecuri repetate (ex: parolă schimbată) — pauze tot mai lungi
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, TOKEN_MANAGER_MAX_SLEEP)
+
     def _auth_headers(self) -> dict[str, str]:
         """Headers cu Bearer token."""
         headers = dict(HEADERS_BASE)
@@ -174,131 +1732,1315 @@ class NovaApiClient:
             }
 
         Returnează True dacă autentificarea a reușit.
+
+        Single-flight: dacă un login e deja în curs, apelanții concurenți
+        așteaptă același rezultat în loc să pornească login-uri succesive.
         """
-        async with self._auth_lock:
-            try:
-                async with self._session.post(
-                    URL_LOGIN,
-                    json={"email": self._email, "password": self._password},
-                    headers=HEADERS_BASE,
-                    timeout=self._timeout,
-                ) as resp:
-                    if resp.status != 200:
-                        _LOGGER.error(
-                            "Login eșuat: status=%s, email=%s", resp.status, self._email
-                        )
-                        return False
-
-                    data = await resp.json()
-                    payload = data.get("data", {}) or {}
-
-                    logged_in = payload.get("loggedInAccount", {}) or {}
-                    viewed = payload.get("viewedAccount", {}) or {}
-                    session_data = payload.get("session", {}) or {}
-
-                    # Token — din data.session.token
-                    self._access_token = session_data.get("token")
-                    if not self._access_token:
-                        # Fallback: token la nivel root (compatibilitate)
-                        self._access_token = data.get("token")
-                    if not self._access_token:
-                        # Fallback: cookie payload-token
-                        cookie = self._session.cookie_jar.filter_cookies(URL_LOGIN)
-                        pt = cookie.get("payload-token")
-                        if pt:
-                            self._access_token = pt.value
-
-                    if not self._access_token:
-                        _LOGGER.error("Login reușit dar token absent din răspuns")
-                        return False
-
-                    self._token_obtained_at = time.monotonic()
-
-                    # Calculăm expires_in din expireAt (epoch)
-                    expire_at = session_data.get("expireAt")
-                    if expire_at and isinstance(expire_at, (int, float)):
-                        self._token_expires_in = int(expire_at - time.time())
-                    else:
-                        # Fallback: exp la nivel root (format APK)
-                        exp = data.get("exp")
-                        if exp and isinstance(exp, (int, float)):
-                            self._token_expires_in = int(exp - time.time())
-                        else:
-                            self._token_expires_in = TOKEN_MAX_AGE
-
-                    # Salvăm payload-ul complet
-                    self._user_data = payload
-
-                    # Cont principal (loggedInAccount)
-                    self._logged_in_account = logged_in
-                    self._crm_logged = str(
-                        logged_in.get("accountNumber", "")
-                    ).strip() or None
-
-                    # Cont vizualizat (viewedAccount)
-                    self._viewed_account = viewed
-                    self._crm_viewed = str(
-                        viewed.get("accountNumber", "")
-                    ).strip() or None
-
-                    # Conturi asociate — din loggedInAccount.associatedAccounts
-                    self._associated_accounts = logged_in.get("associatedAccounts", []) or []
+        task = self._login_task
+        if task is None or task.done():
+            task = asyncio.create_task(self._async_login_request())
+            task.add_done_callback(self._on_login_done)
+            self._login_task = task
+        else:
+            self._coalesced_count += 1
+            _LOGGER.debug("Login deja în curs — se așteaptă rezultatul comun")
+        return await asyncio.shield(task)
 
-                    _LOGGER.info(
-                        "Login reușit: email=%s, crmLogged=%s, crmViewed=%s, "
-                        "asociate=%d",
-                        self._email,
-                        self._crm_logged,
-                        self._crm_viewed,
-                        len(self._associated_accounts),
-                    )
-                    return True
+    async def async_renew_token(self) -> bool:
+        """Reînnoiește sesiunea: refresh-token întâi, login cu parola ca fallback.
+
+        Partajează single-flight-ul cu async_login — un singur drum la server,
+        oricâți apelanți.
+        """
+        task = self._login_task
+        if task is None or task.done():
+            task = asyncio.create_task(self._async_renew_request())
+            task.add_done_callback(self._on_login_done)
+            self._login_task = task
+        else:
+            self._coalesced_count += 1
+            _LOGGER.debug("Reînnoire token deja în curs — se așteaptă rezultatul comun")
+        return await asyncio.shield(task)
+
+    def _on_login_done(self, task: asyncio.Task) -> None:
+        """Un login respins pentru credențiale contează o singură dată la backoff.
+
+        Eșecurile tranzitorii (circuit deschis, 5xx/429, timeout) nu suspendă
+        autentificarea — le tratează retry-ul și circuit breaker-ul.
+        """
+        if task.cancelled() or task.exception() is not None or task.result():
+            return
+        if self._login_rejected:
+            self._note_auth_failure()
+
+    async def _async_renew_request(self) -> bool:
+        if await self._async_refresh_token_request():
+            return True
+        # Login-ul cu parola readuce serverul pe contul principal — dacă
+        # eram comutați pe un cont asociat, revenim pe el
+        view = self._switched_account
+        if not await self._async_login_request():
+            return False
+        if view is not None:
+            await self._async_restore_view(view)
+        return True
 
-            except Exception:
-                _LOGGER.exception("Eroare la login Nova API")
+    async def _async_restore_view(self, account: dict) -> None:
+        """Re-comută pe contul asociat după un login (fără re-autentificare)."""
+        try:
+            resp = await self._send("POST", URL_SWITCH_ACCOUNT, json_body=account)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Revenire pe contul %s eșuată: %s", account.get("accountNumber"), err)
+            return
+        if resp.status == 200:
+            self._set_viewed(account)
+        else:
+            _LOGGER.warning(
+                "Revenire pe contul %s → %s", account.get("accountNumber"), resp.status
+            )
+
+    async def _async_refresh_token_request(self) -> bool:
+        """POST /accounts/refresh-token (Payload CMS) → {refreshedToken, exp}.
+
+        Merge doar cu un token încă valid. Dacă backend-ul nu expune
+        endpoint-ul (404/405/501), nu mai e încercat pentru acest client.
+        """
+        if not self._access_token or self._refresh_supported is False:
+            return False
+        try:
+            resp = await self._send("POST", URL_REFRESH_TOKEN)
+            if resp.status in (404, 405, 501):
+                self._refresh_supported = False
+                _LOGGER.info(
+                    "Refresh-token indisponibil (status=%s) — se folosește login cu parola",
+                    resp.status,
+                )
+                return False
+            if resp.status != 200:
+                _LOGGER.debug("Refresh-token → %s — fallback la login", resp.status)
                 return False
+            data = await self._decode(URL_REFRESH_TOKEN, resp.body)
+        except CircuitOpenError as err:
+            _LOGGER.debug("Refresh-token amânat: %s", err)
+            return False
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Refresh-token eșuat (%s) — fallback la login", err)
+            return False
+
+        token = data.get("refreshedToken") if isinstance(data, dict) else None
+        if not token:
+            _LOGGER.debug("Refresh-token fără refreshedToken — fallback la login")
+            return False
+        self._refresh_supported = True
+        self._access_token = token
+        self._set_token_expiry(data.get("exp"), resp.headers.get("Date"))
+        self._token_refreshes += 1
+        _LOGGER.debug("Token Nova reînnoit prin refresh-token")
+        return True
+
+    async def _async_login_request(self) -> bool:
+        """Login efectiv — apelat doar prin async_login (single-flight)."""
+        self._login_rejected = False
+        try:
+            resp = await self._send(
+                "POST",
+                URL_LOGIN,
+                json_body={"email": self._email, "password": self._password},
+                authenticated=False,
+            )
+            if resp.status != 200:
+                self._login_rejected = resp.status in (400, 401, 403)
+                _LOGGER.error(
+                    "Login eșuat: status=%s, email=%s", resp.status, self._email
+                )
+                return False
+
+            data = await self._decode(URL_LOGIN, resp.body)
+            payload = data.get("data", {}) or {}
+
+            logged_in = payload.get("loggedInAccount", {}) or {}
+            viewed = payload.get("viewedAccount", {}) or {}
+            session_data = payload.get("session", {}) or {}
+
+            # Token — din data.session.token
+            self._access_token = session_data.get("token")
+            if not self._access_token:
+                # Fallback: token la nivel root (compatibilitate)
+                self._access_token = data.get("token")
+            if not self._access_token:
+                # Fallback: cookie payload-token
+                cookie = self._session.cookie_jar.filter_cookies(URL_LOGIN)
+                pt = cookie.get("payload-token")
+                if pt:
+                    self._access_token = pt.value
+
+            if not self._access_token:
+                _LOGGER.error("Login reușit dar token absent din răspuns")
+                return False
+
+            self._password_logins += 1
+            self._switched_account = None  # serverul revine pe contul principal
+            # Expirarea: session.expireAt, apoi exp la nivel root (format APK)
+            expire_at = session_data.get("expireAt")
+            if not expire_at or not isinstance(expire_at, (int, float)):
+                expire_at = data.get("exp")
+            self._set_token_expiry(expire_at, resp.headers.get("Date"))
+
+            # Salvăm payload-ul complet
+            self._user_data = payload
+
+            # Cont principal (loggedInAccount)
+            self._logged_in_account = logged_in
+            self._crm_logged = str(
+                logged_in.get("accountNumber", "")
+            ).strip() or None
+
+            # Cont vizualizat (viewedAccount)
+            self._viewed_account = viewed
+            self._crm_viewed = str(
+                viewed.get("accountNumber", "")
+            ).strip() or None
+
+            # Conturi asociate — din loggedInAccount.associatedAccounts
+            self._associated_accounts = logged_in.get("associatedAccounts", []) or []
+
+            _LOGGER.info(
+                "Login reușit: email=%s, crmLogged=%s, crmViewed=%s, "
+                "asociate=%d",
+                self._email,
+                self._crm_logged,
+                self._crm_viewed,
+                len(self._associated_accounts),
+            )
+            return True
+
+        except CircuitOpenError as err:
+            _LOGGER.debug("Login amânat: %s", err)
+            return False
+        except Exception:
+            _LOGGER.exception("Eroare la login Nova API")
+            return False
 
     async def async_ensure_authenticated(self) -> bool:
-        """Asigură un token valid. Re-login dacă e necesar."""
+        """Asigură un token valid. Reînnoire (refresh-token / login) dacă e necesar.
+
+        După AUTH_FAILURE_LIMIT eșecuri consecutive, reînnoirea e suspendată
+        cu același backoff ca re-autentificarea după 401/403 — un login care
+        eșuează nu se mai repetă la fiecare request.
+        """
+        login = self._login_task
+        if login is not None and not login.done():
+            # Reînnoire în zbor (poate muta serverul pe contul principal) —
+            # request-urile noi pleacă după ea, pe contul corect
+            await asyncio.shield(login)
         if self.is_token_valid():
             return True
-        return await self.async_login()
+        if time.monotonic() < self._auth_blocked_until:
+            _LOGGER.debug("Autentificare suspendată (backoff după eșecuri repetate)")
+            return False
+        return await self.async_renew_token()
+
+    # ──────────────────────────────────────────
+    # Priorități și poarta de cont
+    # ──────────────────────────────────────────
+
+    @asynccontextmanager
+    async def account_gate(self, priority: RequestPriority) -> AsyncIterator[None]:
+        """Deține contul vizualizat pe server pentru o secvență de request-uri.
+
+        Toate request-urile din bloc (inclusiv task-urile pornite din el)
+        intră în limitator cu `priority`. Secvențele care comută contul
+        (refresh, reîncercare, trimitere index) nu se întrepătrund; cele mai
+        puțin prioritare cedează poarta la async_checkpoint().
+        """
+        token = _PRIORITY.set(priority)
+        try:
+            await self._dispatcher.acquire_gate(priority)
+            try:
+                yield
+            finally:
+                self._dispatcher.release_gate()
+        finally:
+            _PRIORITY.reset(token)
+
+    async def async_checkpoint(self) -> None:
+        """Punct sigur (între două conturi): lasă să treacă lucrul mai prioritar."""
+        await self._dispatcher.checkpoint()
 
     # ──────────────────────────────────────────
     # Helpers request
     # ──────────────────────────────────────────
 
-    async def _get(self, url: str, params: dict | None = None) -> Any:
-        """GET request autentificat. Returnează JSON parsed sau None."""
-        if not await self.async_ensure_authenticated():
-            return None
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict | None = None,
+        json_body: dict | None = None,
+        headers: dict[str, str] | None = None,
+        authenticated: bool = True,
+        idempotent: bool | None = None,
+        consumer_factory: Callable[[str], Callable[[bytes], Awaitable[None]]] | None = None,
+    ) -> _RawResponse:
+        """Execută un request și citește corpul complet, cu retry.
+
+        Retry cu backoff exponențial și full jitter pentru erori de rețea,
+        timeout și statusurile din RETRY_STATUSES; la 429/503 se respectă
+        Retry-After (dacă nu depășește RETRY_MAX_DELAY). Numărul de încercări
+        vine din RETRY_ENDPOINT_ATTEMPTS (per endpoint) sau RETRY_MAX_ATTEMPTS.
+
+        idempotent: implicit True pentru GET și pentru endpoint-urile din
+        RETRY_IDEMPOTENT_POSTS. Un request ne-idempotent (ex: /self-readings/add)
+        se repetă doar dacă conexiunea a eșuat ÎNAINTE de trimitere — serverul
+        nu a primit nimic, deci nu există risc de dublură.
+
+        consumer_factory: citire în flux — la fiecare încercare cu status 200
+        se creează un consumator (primește Content-Type) care primește corpul
+        pe bucăți; corpul returnat e atunci gol. Fără hedging în acest mod.
+
+        Fiecare încercare trece prin circuit breaker: erorile de rețea și
+        statusurile 5xx se numără ca eșecuri; cu circuitul deschis se ridică
+        CircuitOpenError imediat, fără request.
+
+        După ultima încercare, excepțiile de rețea se propagă, iar statusurile
+        de eroare se returnează — apelantul decide cum le tratează.
+        """
+        endpoint = _endpoint_key(url)
+        if idempotent is None:
+            idempotent = method == "GET" or endpoint in RETRY_IDEMPOTENT_POSTS
+        attempts = max(1, RETRY_ENDPOINT_ATTEMPTS.get(endpoint, RETRY_MAX_ATTEMPTS))
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self._breaker.allow_request():
+                raise CircuitOpenError(f"{method} {endpoint}: circuit deschis")
+            recorded = False
+            try:
+                if consumer_factory is not None:
+                    resp = await self._send_once(
+                        method,
+                        url,
+                        params=params,
+                        json_body=json_body,
+                        headers=headers,
+                        authenticated=authenticated,
+                        consumer_factory=consumer_factory,
+                    )
+                else:
+                    send = (
+                        self._send_hedged
+                        if self._use_hedging
+                        and method == "GET"
+                        and endpoint in HEDGE_ENDPOINTS
+                        else self._send_once
+                    )
+                    resp = await send(
+                        method,
+                        url,
+                        params=params,
+                        json_body=json_body,
+                        headers=headers,
+                        authenticated=authenticated,
+                    )
+            except _RETRY_EXCEPTIONS as err:
+                self._breaker.record_failure()
+                recorded = True
+                retry_safe = idempotent or isinstance(err, ClientConnectorError)
+                if attempt >= attempts or not retry_safe:
+                    raise
+                delay = _backoff_delay(attempt)
+                _LOGGER.debug(
+                    "%s %s: %s — reîncercare %d/%d în %.1fs",
+                    method, endpoint, type(err).__name__, attempt, attempts - 1, delay,
+                )
+            else:
+                if resp.status >= 500:
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.record_success()
+                recorded = True
+                if resp.status not in RETRY_STATUSES or attempt >= attempts or not idempotent:
+                    return resp
+                delay = _backoff_delay(attempt)
+                if resp.status in (429, 503):
+                    retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        if retry_after > RETRY_MAX_DELAY:
+                            return resp  # serverul cere o pauză prea lungă
+                        delay = retry_after
+                _LOGGER.debug(
+                    "%s %s → %s — reîncercare %d/%d în %.1fs",
+                    method, endpoint, resp.status, attempt, attempts - 1, delay,
+                )
+            finally:
+                if not recorded:
+                    # Anulare / eroare neprevăzută — nu blocăm proba half-open
+                    self._breaker.release_probe()
+
+            self._retry_counts[endpoint] = self._retry_counts.get(endpoint, 0) + 1
+            await asyncio.sleep(delay)
+
+    async def _send_authenticated(self, method: str, url: str, **kwargs: Any) -> _RawResponse:
+        """_send autentificat, cu re-autentificare transparentă la 401/403.
+
+        La 401/403 token-ul folosit e invalidat (doar dacă nu a fost deja
+        înlocuit de un alt apelant), se face o singură reînnoire prin
+        single-flight și request-ul se repetă o dată. După AUTH_FAILURE_LIMIT
+        eșecuri consecutive, re-autentificarea e suspendată cu backoff
+        exponențial — răspunsul 401/403 se returnează direct, fără buclă.
+        """
+        used_token = self._access_token
+        resp = await self._send(method, url, **kwargs)
+        if resp.status not in (401, 403):
+            if resp.status < 400:
+                self._auth_failures = 0
+            return resp
+
+        endpoint = _endpoint_key(url)
+        if time.monotonic() < self._auth_blocked_until:
+            _LOGGER.debug("%s %s → %s (re-autentificare suspendată)", method, endpoint, resp.status)
+            return resp
+
+        _LOGGER.info("%s %s → %s — re-autentificare și reluare", method, endpoint, resp.status)
+        if self._access_token == used_token:
+            self._access_token = None  # token respins de server
+        if self._access_token is None and not await self.async_renew_token():
+            return resp  # eșecul reînnoirii e numărat de _on_login_done
+
+        self._auth_replays += 1
+        replay = await self._send(method, url, **kwargs)
+        if replay.status in (401, 403):
+            self._note_auth_failure()
+        else:
+            self._auth_failures = 0
+        return replay
+
+    def _note_auth_failure(self) -> None:
+        """Eșec de autentificare consecutiv; peste limită — backoff exponențial."""
+        self._auth_failures += 1
+        if self._auth_failures < AUTH_FAILURE_LIMIT:
+            return
+        delay = min(
+            AUTH_BACKOFF_MAX,
+            AUTH_BACKOFF_BASE * 2 ** (self._auth_failures - AUTH_FAILURE_LIMIT),
+        )
+        self._auth_blocked_until = time.monotonic() + delay
+        _LOGGER.warning(
+            "Autentificare Nova eșuată de %d ori la rând — re-autentificarea "
+            "e suspendată %d s",
+            self._auth_failures, delay,
+        )
+
+    async def _send_once(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict | None = None,
+        json_body: dict | None = None,
+        headers: dict[str, str] | None = None,
+        authenticated: bool = True,
+        consumer_factory: Callable[[str], Callable[[bytes], Awaitable[None]]] | None = None,
+    ) -> _RawResponse:
+        """O singură încercare HTTP: trimite request-ul și citește corpul.
+
+        Încercarea ocupă un loc în limitatorul de concurență (prin dispecer,
+        cu prioritatea contextului curent); latența și
+        rezultatul (timeout / 429) ajustează fereastra. Timeout-ul vine din
+        latențele observate pe endpoint (vezi _timeout_for).
+
+        Corpul se citește pe bucăți și nu poate depăși BODY_MAX_BYTES pentru
+        endpoint (ResponseTooLargeError). Cu consumer_factory, bucățile unui
+        răspuns 200 merg direct la consumator, fără a fi acumulate.
+        """
+        request_headers = self._auth_headers() if authenticated else dict(HEADERS_BASE)
+        request_headers.setdefault("Accept-Encoding", _ACCEPT_ENCODING)
+        if headers:
+            request_headers.update(headers)
+        endpoint = _endpoint_key(url)
+        latency_key = _latency_key(endpoint, params)
+        timeout = self._timeout_for(latency_key)
+        # Fazele request-ului (completate de TraceConfig-ul sesiunii + transfer),
+        # etichetate cu contul vizualizat pe server la trimitere
+        timings: dict[str, float] = {}
+        crm = self._crm_viewed
+        await self._dispatcher.acquire()
+        started = time.monotonic()
         try:
-            async with self._session.get(
-                url, headers=self._auth_headers(), params=params, timeout=self._timeout
+            async with self._session.request(
+                method,
+                url,
+                headers=request_headers,
+                params=params,
+                json=json_body,
+                timeout=timeout,
+                trace_request_ctx=timings,
             ) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                _LOGGER.warning("GET %s → %s", url, resp.status)
-                return None
+                body_started = time.monotonic()
+                body = await self._read_body(resp, endpoint, consumer_factory)
+                timings["transfer"] = time.monotonic() - body_started
+                raw = _RawResponse(status=resp.status, headers=resp.headers, body=body)
+            if self._connection_stats:
+                self._connection_stats.record(endpoint, crm, timings)
+        except asyncio.TimeoutError:
+            self._limiter.on_congestion()
+            # Eșantion cenzurat: timeout-ul învățat crește după expirări
+            self._latency.record(latency_key, timeout.total)
+            raise
+        finally:
+            self._dispatcher.release()
+
+        elapsed = time.monotonic() - started
+        if raw.status == 429:
+            self._limiter.on_congestion()
+        elif raw.status < 500:
+            self._limiter.on_success(elapsed)
+            self._latency.record(latency_key, elapsed)
+        return raw
+
+    async def _read_body(
+        self,
+        resp,
+        endpoint: str,
+        consumer_factory: Callable[[str], Callable[[bytes], Awaitable[None]]] | None,
+    ) -> bytes:
+        """Citește corpul pe bucăți, cu limita de mărime a endpoint-ului.
+
+        Dacă sesiunea nu decomprimă singură, corpul se decomprimă aici și se
+        contorizează octeții de pe fir vs. octeții decomprimați. Limita se
+        aplică pe corpul decomprimat (protecție și la „bombe” gzip).
+        """
+        max_bytes = BODY_MAX_BYTES.get(endpoint, BODY_MAX_BYTES_DEFAULT)
+        if resp.content_length is not None and resp.content_length > max_bytes:
+            raise ResponseTooLargeError(
+                f"{endpoint}: Content-Length {resp.content_length} > {max_bytes} octeți"
+            )
+        consumer = None
+        if consumer_factory is not None and resp.status == 200:
+            consumer = consumer_factory(resp.headers.get("Content-Type", ""))
+        decompressor = None
+        if not getattr(self._session, "auto_decompress", True):
+            decompressor = _BodyDecompressor(resp.headers.get("Content-Encoding", ""))
+
+        chunks: list[bytes] = []
+        wire = 0
+        received = 0
+
+        async def _accept(data: bytes) -> None:
+            nonlocal received
+            received += len(data)
+            if received > max_bytes:
+                raise ResponseTooLargeError(
+                    f"{endpoint}: corpul depășește {max_bytes} octeți"
+                )
+            if consumer is not None:
+                await consumer(data)
+            else:
+                chunks.append(data)
+
+        async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+            wire += len(chunk)
+            await _accept(decompressor.decompress(chunk) if decompressor else chunk)
+        if decompressor is not None:
+            await _accept(decompressor.flush())
+
+        self._record_transfer(endpoint, wire, received)
+        return b"".join(chunks)
+
+    def _record_transfer(self, endpoint: str, wire: int, body: int) -> None:
+        """Contorizează octeții per endpoint, per refresh și per zi."""
+        stats = self._transfer_stats.setdefault(
+            endpoint, {"requests": 0, "wire_bytes": 0, "body_bytes": 0}
+        )
+        stats["requests"] += 1
+        stats["wire_bytes"] += wire
+        stats["body_bytes"] += body
+        self._cycle_bytes["wire_bytes"] += wire
+        self._cycle_bytes["body_bytes"] += body
+
+        day = time.strftime("%Y-%m-%d")
+        totals = self._daily_bytes.setdefault(day, {"wire_bytes": 0, "body_bytes": 0})
+        totals["wire_bytes"] += wire
+        totals["body_bytes"] += body
+        while len(self._daily_bytes) > TRANSFER_DAYS_KEPT:
+            self._daily_bytes.pop(next(iter(self._daily_bytes)))
+
+    def start_transfer_cycle(self) -> None:
+        """Începe contorizarea unui refresh nou (apelat de coordinator)."""
+        self._last_cycle_bytes = self._cycle_bytes
+        self._cycle_bytes = {"wire_bytes": 0, "body_bytes": 0}
+        if self._connection_stats:
+            self._connection_stats.start_cycle()
+
+    def log_refresh_trace(self, refresh: int) -> None:
+        """O linie JSON per refresh cu fazele request-urilor.
+
+        Se scrie doar cu logger-ul `custom_components.vreaulanova.api.trace`
+        pe nivel debug (configurabil separat în `logger:`).
+        """
+        if not self._connection_stats or not _TRACE_LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        summary = {
+            "refresh": refresh,
+            "crm": self._crm_logged,
+            **self._connection_stats.cycle_summary(),
+            **self._cycle_bytes,
+        }
+        _TRACE_LOGGER.debug("refresh_trace %s", json.dumps(summary, separators=(",", ":")))
+
+    def _timeout_for(self, endpoint: str) -> ClientTimeout:
+        """Timeout per endpoint: p99 × TIMEOUT_P99_MULTIPLIER, între floor și ceiling.
+
+        Fără destule eșantioane se folosește API_TIMEOUT.
+        """
+        p99 = self._latency.percentile(endpoint, 0.99)
+        if p99 is None:
+            return self._timeout
+        total = min(TIMEOUT_CEILING, max(TIMEOUT_FLOOR, p99 * TIMEOUT_P99_MULTIPLIER))
+        return ClientTimeout(total=round(total, 1))
+
+    async def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict | None = None,
+        json_body: dict | None = None,
+        headers: dict[str, str] | None = None,
+        authenticated: bool = True,
+    ) -> _RawResponse:
+        """O încercare cu hedging: dacă primul request nu răspunde până la p95,
+        se trimite o copie; primul răspuns reușit câștigă, celălalt e anulat.
+
+        Un 5xx / 429 venit repede nu câștigă: se așteaptă celălalt request și
+        statusul de eroare se întoarce doar dacă ambele au eșuat.
+
+        Numărul de copii e limitat la HEDGE_BUDGET_RATIO din request-urile
+        eligibile. Fără destule eșantioane de latență nu se face hedging.
+        """
+        endpoint = _endpoint_key(url)
+        self._hedge_eligible += 1
+
+        def _attempt() -> asyncio.Task:
+            return asyncio.get_running_loop().create_task(
+                self._send_once(
+                    method,
+                    url,
+                    params=params,
+                    json_body=json_body,
+                    headers=headers,
+                    authenticated=authenticated,
+                )
+            )
+
+        primary = _attempt()
+        p95 = self._latency.percentile(_latency_key(endpoint, params), 0.95)
+        if p95 is None:
+            return await primary
+
+        delay = max(p95, HEDGE_MIN_DELAY)
+        pending: set[asyncio.Task] = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or self._hedges_fired >= HEDGE_BUDGET_RATIO * self._hedge_eligible:
+                return await primary
+
+            self._hedges_fired += 1
+            hedge = _attempt()
+            pending.add(hedge)
+            _LOGGER.debug("GET %s: fără răspuns după %.2fs — hedge trimis", endpoint, delay)
+
+            error: BaseException | None = None
+            lost: _RawResponse | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif _hedge_lost(task.result().status):
+                        lost = task.result()
+                    else:
+                        if task is hedge:
+                            self._hedges_won += 1
+                        return task.result()
+            if lost is not None:
+                return lost
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _decode(self, url: str, body: bytes) -> Any:
+        """Decodează corpul JSON; peste DECODE_EXECUTOR_THRESHOLD octeți în executor.
+
+        Timpul și octeții decodați se contorizează per endpoint.
+        """
+        data, elapsed = await self._decode_timed(url, body)
+        if self._connection_stats:
+            self._connection_stats.record(
+                _endpoint_key(url), self._crm_viewed, {"decode": elapsed}
+            )
+        return data
+
+    async def _decode_timed(self, url: str, body: bytes) -> tuple[Any, float]:
+        """_decode fără faza de trace — întoarce și durata decodării."""
+        offload = len(body) >= DECODE_EXECUTOR_THRESHOLD
+        started = time.perf_counter()
+        if offload:
+            data = await asyncio.get_running_loop().run_in_executor(
+                None, self._json_loads, body
+            )
+        else:
+            data = self._json_loads(body)
+        elapsed = time.perf_counter() - started
+
+        stats = self._decode_stats.setdefault(
+            _endpoint_key(url), {"count": 0, "bytes": 0, "seconds": 0.0, "offloaded": 0}
+        )
+        stats["count"] += 1
+        stats["bytes"] += len(body)
+        stats["seconds"] += elapsed
+        stats["offloaded"] += offload
+        return data, elapsed
+
+    def _projection_params(self, endpoint: str) -> dict[str, Any] | None:
+        """Parametrii de proiecție (depth + select) pentru endpoint, dacă există."""
+        projection = API_FIELD_PROJECTIONS.get(endpoint)
+        if not projection or endpoint in self._projection_disabled:
+            return None
+        params: dict[str, Any] = {"depth": projection["depth"]}
+        for field_name in projection["fields"]:
+            params[f"select[{field_name}]"] = "true"
+        return params
+
+    async def _get_json(self, url: str, params: dict | None) -> tuple[int, Any, int]:
+        """GET condițional: (status, JSON parsed, octeți corp) cu validatori HTTP.
+
+        Trimite If-None-Match / If-Modified-Since dacă avem o intrare în cache
+        (cheie: URL + parametri + CRM-ul vizualizat pe server — validatorii
+        unui cont nu se trimit niciodată pentru altul). La 304 — sau dacă serverul nu
+        trimite validatori, dar corpul are același hash — se returnează
+        obiectul deja parsat, fără decodare JSON, cu status 304.
+        """
+        key = (
+            url,
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+            self._crm_viewed,
+        )
+        cached = self._conditional_cache.get(key)
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        resp = await self._send_authenticated("GET", url, params=params, headers=headers)
+        if resp.status == 304 and cached is not None:
+            self._conditional_cache.not_modified += 1
+            _LOGGER.debug("GET %s → 304 (din cache)", _endpoint_key(url))
+            return 304, cached.data, cached.size
+        if resp.status != 200:
+            return resp.status, None, 0
+        _ensure_json(resp.headers.get("Content-Type"), _endpoint_key(url))
+        _LOGGER.debug("GET %s → %d octeți", _endpoint_key(url), len(resp.body))
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        body_hash = hashlib.blake2b(resp.body, digest_size=16).hexdigest()
+        status = 200
+        if cached is not None and cached.body_hash == body_hash:
+            self._conditional_cache.unchanged_body += 1
+            data = cached.data
+            status = 304
+        else:
+            self._conditional_cache.misses += 1
+            data = await self._decode(url, resp.body)
+        self._conditional_cache.put(
+            key,
+            _ValidatorEntry(
+                etag=etag,
+                last_modified=last_modified,
+                body_hash=body_hash,
+                data=data,
+                size=len(resp.body),
+            ),
+        )
+        return status, data, len(resp.body)
+
+    async def _get(
+        self,
+        url: str,
+        params: dict | None = None,
+        *,
+        where: dict | None = None,
+        sort: str | None = None,
+        limit: int | None = None,
+    ) -> Any:
+        """GET request autentificat. Returnează JSON parsed sau None.
+
+        where/sort/limit: clauze Payload CMS, traduse în query-string
+        (where[câmp][operator]=valoare, sort=-câmp, limit=N). Dacă backend-ul
+        respinge filtrul (400), where se dezactivează pentru endpoint și se
+        repetă request-ul fără el — apelantul primește un superset.
+
+        Dacă endpoint-ul are o proiecție declarată (API_FIELD_PROJECTIONS),
+        se cer doar câmpurile consumate. Dacă backend-ul respinge parametrii
+        (400) sau întoarce documente fără niciunul dintre câmpurile cerute,
+        proiecția se dezactivează pentru endpoint și se repetă request-ul simplu.
+
+        GET-uri identice concurente (URL + parametri + CRM activ) — ex: buton
+        apăsat în timpul unui refresh programat — partajează un singur request.
+        Starea request-ului (ResultStatus) se înregistrează pentru async_call.
+        """
+        result = await self._get_result(url, params, where=where, sort=sort, limit=limit)
+        _note_outcome(result.status)
+        return result.data
+
+    async def _get_result(
+        self,
+        url: str,
+        params: dict | None = None,
+        *,
+        where: dict | None = None,
+        sort: str | None = None,
+        limit: int | None = None,
+    ) -> ApiResult:
+        """_get cu rezultat tipizat (single-flight, fallback where — vezi _get)."""
+        endpoint = _endpoint_key(url)
+        if where and endpoint in self._where_disabled:
+            where = None
+        result = await self._get_coalesced(
+            url, _query_params(params, where, sort, limit)
+        )
+        if where and result.http_status == 400:
+            # Filtrul respins — următoarele cereri pleacă fără where
+            self._where_disabled.add(endpoint)
+            _LOGGER.info(
+                "Filtrele where nu sunt suportate pentru %s (status=400) — "
+                "se cere fără filtru",
+                endpoint,
+            )
+            result = await self._get_coalesced(
+                url, _query_params(params, None, sort, limit)
+            )
+        return result
+
+    async def _get_coalesced(self, url: str, params: dict | None) -> ApiResult:
+        """Single-flight peste _get_uncoalesced."""
+        # Single-flight: apelanții concurenți cu aceeași cheie așteaptă același task.
+        # Cheia include contul vizualizat pe server — aceeași cale cerută pentru
+        # două conturi înseamnă două request-uri distincte.
+        key = (
+            "GET",
+            url,
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+            self._crm_viewed,
+        )
+        entry = self._inflight.get(key)
+        if entry is None:
+            flight = _SharedFlight(_PRIORITY.get())
+            task = asyncio.create_task(self._get_shared(flight, url, params))
+            self._inflight[key] = (task, flight)
+            task.add_done_callback(lambda done, k=key: self._forget_inflight(k, done))
+        else:
+            task, flight = entry
+            self._coalesced_count += 1
+            # Task-ul comun urcă la prioritatea celui mai prioritar apelant
+            self._dispatcher.promote(flight, _PRIORITY.get())
+            _LOGGER.debug("GET %s deja în zbor — se așteaptă rezultatul comun", url)
+        # shield — anularea unui apelant nu anulează request-ul celorlalți
+        return await asyncio.shield(task)
+
+    async def _get_shared(
+        self, flight: _SharedFlight, url: str, params: dict | None
+    ) -> ApiResult:
+        """Corpul task-ului single-flight: request-urile lui folosesc `flight`."""
+        _FLIGHT.set(flight)
+        return await self._get_uncoalesced(url, params)
+
+    def _forget_inflight(self, key: tuple, task: asyncio.Task) -> None:
+        """Scoate task-ul terminat din tabela single-flight."""
+        entry = self._inflight.get(key)
+        if entry is not None and entry[0] is task:
+            del self._inflight[key]
+
+    async def _get_uncoalesced(self, url: str, params: dict | None) -> ApiResult:
+        """Corpul lui _get: autentificare, cache TTL, proiecție, GET condițional."""
+        if not await self.async_ensure_authenticated():
+            return ApiResult(ResultStatus.AUTH_ERROR)
+
+        endpoint = _endpoint_key(url)
+        ttl = RESPONSE_CACHE_TTL.get(endpoint)
+        cache_crm = None if endpoint in RESPONSE_CACHE_GLOBAL else self._crm_viewed
+        cache_key = (
+            url,
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+            cache_crm,
+        )
+        if ttl:
+            hit, cached_data = self._response_cache.get(cache_key)
+            if hit:
+                return ApiResult(ResultStatus.NOT_MODIFIED, cached_data)
+
+        try:
+            projection = self._projection_params(endpoint)
+            if projection:
+                status, data, size = await self._get_json(
+                    url, {**(params or {}), **projection}
+                )
+                if status in (200, 304):
+                    if _projection_honoured(data, API_FIELD_PROJECTIONS[endpoint]["fields"]):
+                        return self._get_success(
+                            status, data, size, ttl, cache_key, endpoint, cache_crm
+                        )
+                elif status != 400:
+                    _LOGGER.warning("GET %s → %s", url, status)
+                    return _status_result(status)
+                # Proiecția nu e suportată — revenim la răspunsul complet
+                self._projection_disabled.add(endpoint)
+                _LOGGER.info(
+                    "Proiecția de câmpuri nu e suportată pentru %s (status=%s) — "
+                    "se cere răspunsul complet",
+                    endpoint, status,
+                )
+
+            status, data, size = await self._get_json(url, params)
+            if status in (200, 304):
+                return self._get_success(
+                    status, data, size, ttl, cache_key, endpoint, cache_crm
+                )
+            if status == 400 and projection:
+                # Și fără proiecție → 400: vina e a altui parametru (ex: where)
+                self._projection_disabled.discard(endpoint)
+            _LOGGER.warning("GET %s → %s", url, status)
+            return _status_result(status)
+        except CircuitOpenError as err:
+            _LOGGER.debug("%s", err)
+        except (ResponseTooLargeError, ValueError) as err:
+            _LOGGER.warning("GET %s: răspuns respins (%s)", url, err)
         except Exception:
             _LOGGER.exception("Eroare GET %s", url)
-            return None
+        return ApiResult(ResultStatus.TRANSIENT_ERROR)
+
+    def _get_success(
+        self,
+        status: int,
+        data: Any,
+        size: int,
+        ttl: int | None,
+        cache_key: tuple,
+        endpoint: str,
+        cache_crm: str | None,
+    ) -> ApiResult:
+        """Răspuns reușit: cache TTL + ApiResult (OK / NOT_MODIFIED)."""
+        if ttl:
+            self._response_cache.put(
+                cache_key, data, size, ttl, endpoint=endpoint, crm=cache_crm
+            )
+        if status == 304:
+            return ApiResult(ResultStatus.NOT_MODIFIED, data)
+        return ApiResult(ResultStatus.OK, data)
 
     async def _post(self, url: str, body: dict | None = None) -> Any:
         """POST request autentificat. Returnează JSON parsed sau None."""
         if not await self.async_ensure_authenticated():
+            _note_outcome(ResultStatus.AUTH_ERROR)
             return None
         try:
-            async with self._session.post(
-                url, headers=self._auth_headers(), json=body, timeout=self._timeout
-            ) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                _LOGGER.warning("POST %s → %s", url, resp.status)
-                return None
+            resp = await self._send_authenticated("POST", url, json_body=body)
+            if resp.status == 200:
+                _note_outcome(ResultStatus.OK)
+                return await self._decode(url, resp.body)
+            _LOGGER.warning("POST %s → %s", url, resp.status)
+            _note_outcome(_status_result(resp.status).status)
+            return None
+        except CircuitOpenError as err:
+            _LOGGER.debug("%s", err)
         except Exception:
             _LOGGER.exception("Eroare POST %s", url)
-            return None
+        _note_outcome(ResultStatus.TRANSIENT_ERROR)
+        return None
+
+    async def async_call(
+        self, getter: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> ApiResult:
+        """Apelează un getter (ex: async_get_invoices) și întoarce un ApiResult.
+
+        Getter-ele păstrează semnătura veche (None / [] la eșec); aici se
+        colectează starea fiecărui request făcut în timpul apelului, ca
+        apelantul să distingă „gol” de „eșuat” și „nemodificat” de „nou”:
+          - AUTH_ERROR / TRANSIENT_ERROR dacă vreun request a eșuat
+            (data = ce s-a obținut parțial, de obicei de ignorat);
+          - EMPTY dacă totul a reușit, dar nu există date;
+          - NOT_MODIFIED dacă toate răspunsurile au venit din cache / 304;
+          - OK altfel.
+        """
+        outcome = _CallOutcome()
+        token = _CALL_OUTCOME.set(outcome)
+        try:
+            data = await getter(*args, **kwargs)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Eroare la %s: %s", getattr(getter, "__name__", getter), err)
+            return ApiResult(ResultStatus.TRANSIENT_ERROR)
+        finally:
+            _CALL_OUTCOME.reset(token)
+
+        status = outcome.status
+        if status in (ResultStatus.AUTH_ERROR, ResultStatus.TRANSIENT_ERROR):
+            return ApiResult(status, data)
+        if _is_empty(data):
+            return ApiResult(ResultStatus.EMPTY, data)
+        if status is ResultStatus.NOT_MODIFIED:
+            return ApiResult(ResultStatus.NOT_MODIFIED, data)
+        return ApiResult(ResultStatus.OK, data)
+
+    async def async_probe_backend(self) -> bool:
+        """Trimite proba half-open (GET app-info, fără cache).
+
+        Returnează True dacă circuitul e închis după probă. Cu circuitul
+        deschis (timpul de recuperare nu a trecut) returnează False imediat.
+        """
+        if self._breaker.state == "closed":
+            return True
+        if self._breaker.state == "open":
+            return False
+        try:
+            await self._send("GET", URL_APP_INFO)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Proba backend Nova eșuată: %s", err)
+        return self._breaker.state == "closed"
+
+    async def async_prewarm(self) -> None:
+        """Deschide din timp conexiunea TLS către backend (înainte de refresh).
+
+        HEAD pe app-info, fără autentificare; conexiunea rămâne în pool
+        (keep-alive) pentru primul request al refresh-ului. Erorile se ignoră.
+        """
+        if self._breaker.state != "closed":
+            return
+        token = _PRIORITY.set(RequestPriority.BACKFILL)
+        await self._dispatcher.acquire()
+        try:
+            async with self._session.head(
+                URL_APP_INFO,
+                headers=HEADERS_BASE,
+                timeout=ClientTimeout(total=TIMEOUT_FLOOR),
+            ):
+                pass
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Pre-încălzire conexiune Nova eșuată: %s", err)
+            return
+        finally:
+            self._dispatcher.release()
+            _PRIORITY.reset(token)
+        if self._connection_stats:
+            self._connection_stats.prewarmed += 1
+
+    async def async_close(self) -> None:
+        """Închide sesiunea HTTP (dedicată intrării — vezi __init__.py)."""
+        if not self._session.closed:
+            await self._session.close()
+
+    # ──────────────────────────────────────────
+    # Paginare (colecții Payload CMS)
+    # ──────────────────────────────────────────
+
+    async def async_iter_docs(
+        self,
+        url: str,
+        params: dict | None = None,
+        *,
+        page_size: int = API_PAGE_SIZE,
+        stop_when: Callable[[dict], bool] | None = None,
+        where: dict | None = None,
+        sort: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """Parcurge o colecție Payload CMS pagină cu pagină.
+
+        Răspunsul paginat Payload: {docs, hasNextPage, nextPage, page, totalDocs}.
+        Documentele se emit pe măsură ce sosesc paginile — consumatorul nu
+        trebuie să țină toate paginile în memorie.
+
+        stop_when: predicat opțional — iterarea se oprește (fără a emite
+        documentul) la primul document pentru care întoarce True. Util când
+        apelantul ajunge la înregistrări pe care le are deja.
+        where/sort: filtrare și sortare pe server (vezi _get).
+        """
+        page = 1
+        for _ in range(API_MAX_PAGES):
+            query = dict(params or {})
+            query["page"] = page
+
+            raw = await self._get(
+                url, params=query, where=where, sort=sort, limit=page_size
+            )
+            if isinstance(raw, list):
+                # Endpoint nepaginat — lista vine direct
+                for doc in raw:
+                    if stop_when is not None and stop_when(doc):
+                        return
+                    yield doc
+                return
+            if not raw or not isinstance(raw, dict):
+                return
+
+            for doc in raw.get("docs", []) or []:
+                if stop_when is not None and stop_when(doc):
+                    return
+                yield doc
+
+            if not raw.get("hasNextPage"):
+                return
+            next_page = raw.get("nextPage")
+            if isinstance(next_page, int) and next_page > page:
+                page = next_page
+            else:
+                page += 1
+
+        _LOGGER.warning(
+            "Paginare %s oprită după %d pagini (plafon de siguranță)",
+            url, API_MAX_PAGES,
+        )
+
+    async def async_stream_docs(
+        self,
+        url: str,
+        on_doc: Callable[[Any], None],
+        *,
+        page_size: int = API_PAGE_SIZE,
+        where: dict | None = None,
+        sort: str | None = None,
+        on_restart: Callable[[], None] | None = None,
+    ) -> bool:
+        """Parcurge o colecție citind fiecare pagină în flux.
+
+        Spre deosebire de async_iter_docs, corpul nu e citit întreg: fiecare
+        document din docs[] e decodat imediat ce e complet și predat lui
+        on_doc (acumulatorul apelantului). Corpul brut al paginii nu se ține
+        în memorie; documentele decodate rămân însă la apelant (ex: lista din
+        async_get_payments). Nu trece prin cache-uri (ETag / TTL) — potrivit
+        pentru descărcările complete ale colecțiilor mari.
+
+        Returnează True dacă toate paginile au fost citite complet.
+
+        Un 400 (pe orice pagină) se tratează ca în _get: întâi se repetă
+        pagina fără proiecție, apoi fără where. Paginile nefiltrate nu
+        corespund celor filtrate, deci renunțarea la where după prima pagină
+        reia colecția de la început — doar dacă apelantul poate goli
+        acumulatorul (on_restart); altfel ciclul curent eșuează.
+        """
+        if not await self.async_ensure_authenticated():
+            _note_outcome(ResultStatus.AUTH_ERROR)
+            return False
+        endpoint = _endpoint_key(url)
+        if where and endpoint in self._where_disabled:
+            where = None
+
+        page = 1
+        projection_dropped = False
+        for _ in range(API_MAX_PAGES):
+            projection = self._projection_params(endpoint)
+            base = _query_params(projection, where, sort, page_size)
+            status, meta = await self._stream_page(url, {**base, "page": page}, on_doc)
+            if status == 400:
+                if projection is not None:
+                    # Proiecția respinsă — aceeași pagină, fără ea
+                    self._projection_disabled.add(endpoint)
+                    projection_dropped = True
+                    _LOGGER.info(
+                        "Proiecția de câmpuri nu e suportată pentru %s (status=400) — "
+                        "se cere răspunsul complet",
+                        endpoint,
+                    )
+                    continue
+                if where:
+                    if projection_dropped:
+                        # Și fără proiecție → 400: vina e a filtrului
+                        self._projection_disabled.discard(endpoint)
+                        projection_dropped = False
+                    self._where_disabled.add(endpoint)
+                    _LOGGER.info(
+                        "Filtrele where nu sunt suportate pentru %s (status=400) — "
+                        "se cere fără filtru",
+                        endpoint,
+                    )
+                    where = None
+                    if page == 1:
+                        continue
+                    if on_restart is not None:
+                        on_restart()
+                        page = 1
+                        continue
+                _LOGGER.warning("GET %s (flux) → 400", url)
+                _note_outcome(ResultStatus.TRANSIENT_ERROR)
+                return False
+            if meta is None:
+                return False
+            if not meta.get("hasNextPage"):
+                return True
+            next_page = meta.get("nextPage")
+            page = next_page if isinstance(next_page, int) and next_page > page else page + 1
+
+        _LOGGER.warning(
+            "Paginare %s oprită după %d pagini (plafon de siguranță)",
+            url, API_MAX_PAGES,
+        )
+        return True
+
+    async def _stream_page(
+        self, url: str, params: dict, on_doc: Callable[[Any], None]
+    ) -> tuple[int | None, dict | None]:
+        """O pagină citită în flux → (status HTTP, metadatele paginării sau None).
+
+        Fiecare document trece prin decodorul comun (_decode_timed: orjson,
+        executor peste DECODE_EXECUTOR_THRESHOLD, statistici per endpoint);
+        timpul de decodare al paginii intră în trace ca o singură fază decode.
+        La o reîncercare, documentele deja predate din încercarea anterioară
+        se sar (după poziție, fără a mai fi decodate), ca acumulatorul să nu
+        primească dubluri.
+        """
+        endpoint = _endpoint_key(url)
+        crm = self._crm_viewed
+        delivered = 0
+        decode_seconds = 0.0
+        parser: _DocsStreamParser | None = None
+
+        def _consumer(content_type: str) -> Callable[[bytes], Awaitable[None]]:
+            nonlocal parser
+            _ensure_json(content_type, endpoint)
+            parser = _DocsStreamParser()
+            position = 0
+
+            async def _feed(chunk: bytes) -> None:
+                nonlocal delivered, position, decode_seconds
+                for raw in parser.feed(chunk):
+                    position += 1
+                    if position > delivered:
+                        doc, elapsed = await self._decode_timed(url, raw)
+                        decode_seconds += elapsed
+                        delivered = position
+                        on_doc(doc)
+
+            return _feed
+
+        try:
+            resp = await self._send_authenticated(
+                "GET", url, params=params, consumer_factory=_consumer
+            )
+            if resp.status == 400:
+                # Decide apelantul (async_stream_docs): fără proiecție / fără where
+                return resp.status, None
+            if resp.status != 200 or parser is None:
+                _LOGGER.warning("GET %s (flux) → %s", url, resp.status)
+                _note_outcome(_status_result(resp.status).status)
+                return resp.status, None
+            meta, elapsed = await self._decode_timed(url, parser.close())
+            decode_seconds += elapsed
+            if not isinstance(meta, dict):
+                raise ValueError("răspuns paginat invalid")
+            meta.pop("docs", None)
+            _note_outcome(ResultStatus.OK)
+            return resp.status, meta
+        except CircuitOpenError as err:
+            _LOGGER.debug("%s", err)
+        except (ResponseTooLargeError, ValueError) as err:
+            _LOGGER.warning("GET %s (flux): răspuns respins (%s)", url, err)
+        except Exception:
+            _LOGGER.exception("Eroare GET %s (flux)", url)
+        finally:
+            if self._connection_stats and parser is not None:
+                self._connection_stats.record(endpoint, crm, {"decode": decode_seconds})
+        _note_outcome(ResultStatus.TRANSIENT_ERROR)
+        return None, None
+
+    async def async_iter_metering_points(
+        self,
+        *,
+        page_size: int = API_PAGE_SIZE,
+        stop_when: Callable[[dict], bool] | None = None,
+    ) -> AsyncIterator[dict]:
+        """Iterează /metering-points pagină cu pagină."""
+        async for doc in self.async_iter_docs(
+            URL_METERING_POINTS, page_size=page_size, stop_when=stop_when
+        ):
+            yield doc
+
+    async def async_iter_self_readings(
+        self,
+        *,
+        page_size: int = API_PAGE_SIZE,
+        stop_when: Callable[[dict], bool] | None = None,
+        updated_after: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """Iterează /self-readings pagină cu pagină.
+
+        updated_after: dacă e setat, se cer doar documentele modificate după
+        acest moment (ISO 8601, din câmpul updatedAt) — sincronizare delta.
+        """
+        async for doc in self.async_iter_docs(
+            URL_SELF_READINGS,
+            page_size=page_size,
+            stop_when=stop_when,
+            where=_delta_where(updated_after),
+        ):
+            yield doc
+
+    async def async_iter_invoices(
+        self,
+        *,
+        page_size: int = API_PAGE_SIZE,
+        stop_when: Callable[[dict], bool] | None = None,
+    ) -> AsyncIterator[dict]:
+        """Iterează /invoices pagină cu pagină.
+
+        Atenție: fiecare doc e un wrapper {invoices[], balance, ...}, nu o factură —
+        de aceea nu există variantă delta și nici filtre where: updatedAt,
+        issueDate, status sau utilityType ar filtra wrapper-ul, nu facturile.
+        """
+        async for doc in self.async_iter_docs(
+            URL_INVOICES, page_size=page_size, stop_when=stop_when
+        ):
+            yield doc
+
+    async def async_iter_contracts(
+        self,
+        *,
+        page_size: int = API_PAGE_SIZE,
+        stop_when: Callable[[dict], bool] | None = None,
+    ) -> AsyncIterator[dict]:
+        """Iterează /contracts pagină cu pagină."""
+        async for doc in self.async_iter_docs(
+            URL_CONTRACTS, page_size=page_size, stop_when=stop_when
+        ):
+            yield doc
+
+    async def async_iter_payments(
+        self,
+        *,
+        page_size: int = API_PAGE_SIZE,
+        stop_when: Callable[[dict], bool] | None = None,
+        updated_after: str | None = None,
+        where: dict | None = None,
+        sort: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """Iterează /payments pagină cu pagină.
+
+        updated_after: vezi async_iter_self_readings.
+        where/sort: filtre suplimentare pe server (combinate cu delta prin AND).
+        """
+        async for doc in self.async_iter_docs(
+            URL_PAYMENTS,
+            page_size=page_size,
+            stop_when=stop_when,
+            where=_combine_where(_delta_where(updated_after), where),
+            sort=sort,
+        ):
+            yield doc
 
     # ──────────────────────────────────────────
     # Endpoint-uri date
@@ -315,17 +3057,12 @@ class NovaApiClient:
         return None
 
     async def async_get_metering_points(self) -> list[dict]:
-        """GET /metering-points → lista puncte de măsurare.
+        """GET /metering-points → lista puncte de măsurare (toate paginile).
 
         Fiecare punct conține: utilityType, specificIdForUtilityType, address,
         meteringPointId, number, contractId, meters[], gasRevisions[]
         """
-        raw = await self._get(URL_METERING_POINTS, params={"limit": 100})
-        if raw and isinstance(raw, dict):
-            return raw.get("docs", [])
-        if isinstance(raw, list):
-            return raw
-        return []
+        return [doc async for doc in self.async_iter_metering_points()]
 
     async def async_get_metering_points_self_readings(self) -> list[dict]:
         """GET /metering-points/self-readings → puncte pt autocitiri."""
@@ -350,19 +3087,25 @@ class NovaApiClient:
             return raw
         return None
 
-    async def async_get_self_readings(self) -> list[dict]:
-        """GET /self-readings → istoric autocitiri (toate punctele de măsurare).
+    async def async_get_self_readings(self, updated_after: str | None = None) -> list[dict]:
+        """GET /self-readings → istoric autocitiri (toate punctele, toate paginile).
 
         Fiecare intrare: month, utilityType, lastSelfReadingDate, meterSeries,
         consumptionOldIndex, consumptionNewIndex, consumption, unit, dialCode,
         meteringPointAddress
+
+        updated_after: doar autocitirile modificate după acest moment (delta).
+        Descărcarea completă (fără updated_after) se citește în flux.
         """
-        raw = await self._get(URL_SELF_READINGS, params={"limit": 100})
-        if raw and isinstance(raw, dict):
-            return raw.get("docs", [])
-        if isinstance(raw, list):
-            return raw
-        return []
+        if updated_after is None:
+            docs: list[dict] = []
+            await self.async_stream_docs(
+                URL_SELF_READINGS, docs.append, on_restart=docs.clear
+            )
+            return docs
+        return [
+            doc async for doc in self.async_iter_self_readings(updated_after=updated_after)
+        ]
 
     async def async_get_invoices(self) -> dict | None:
         """GET /invoices → wrapper cu facturi + balance.
@@ -371,13 +3114,12 @@ class NovaApiClient:
           - invoices: [{invoiceId, utilityType, amountTotal, amountToPay, dueDate, status, ...}]
           - balance: {total, prosumer}
           - shouldPayAllBtnBeDisabled: bool
+
+        Dacă răspunsul e paginat, facturile din paginile următoare se adaugă
+        în lista invoices a primului wrapper. Lista e completă (nefiltrată):
+        invoices_by_mp și senzorii de restanțe au nevoie și de anii anteriori.
         """
-        raw = await self._get(URL_INVOICES, params={"limit": 100})
-        if raw and isinstance(raw, dict):
-            docs = raw.get("docs", [])
-            if docs and isinstance(docs, list) and len(docs) > 0:
-                return docs[0]  # Wrapper-ul principal
-        return None
+        return _merge_invoice_wrappers([doc async for doc in self.async_iter_invoices()])
 
     async def async_get_balances(self) -> dict | None:
         """GET /balances → sold separat.
@@ -392,16 +3134,11 @@ class NovaApiClient:
         return None
 
     async def async_get_contracts(self) -> list[dict]:
-        """GET /contracts → lista contracte.
+        """GET /contracts → lista contracte (toate paginile).
 
         Fiecare: number, utilityType, status, signedAt, etc.
         """
-        raw = await self._get(URL_CONTRACTS, params={"limit": 100})
-        if raw and isinstance(raw, dict):
-            return raw.get("docs", [])
-        if isinstance(raw, list):
-            return raw
-        return []
+        return [doc async for doc in self.async_iter_contracts()]
 
     async def async_get_contracts_delivery(self) -> list[dict]:
         """GET /contracts/invoice-delivery-type."""
@@ -412,14 +3149,181 @@ class NovaApiClient:
             return raw
         return []
 
-    async def async_get_payments(self) -> list[dict]:
-        """GET /payments → istoric plăți."""
-        raw = await self._get(URL_PAYMENTS, params={"limit": 100})
-        if raw and isinstance(raw, dict):
-            return raw.get("docs", [])
-        if isinstance(raw, list):
-            return raw
-        return []
+    async def async_get_payments(
+        self,
+        updated_after: str | None = None,
+        *,
+        year: int | None = None,
+    ) -> list[dict]:
+        """GET /payments → istoric plăți (toate paginile).
+
+        updated_after: doar plățile modificate după acest moment (delta).
+        year: doar plățile din anul dat, sortate descrescător după dată.
+        Descărcarea completă (fără updated_after) se citește în flux.
+        """
+        if updated_after is None:
+            docs: list[dict] = []
+            await self.async_stream_docs(
+                URL_PAYMENTS,
+                docs.append,
+                where=_payments_archive_where(year),
+                sort="-date" if year is not None else None,
+                on_restart=docs.clear,
+            )
+            return docs
+        return [
+            doc async for doc in self.async_iter_payments(
+                updated_after=updated_after,
+                where=_payments_archive_where(year),
+                sort="-date" if year is not None else None,
+            )
+        ]
+
+    # ──────────────────────────────────────────
+    # GraphQL — un singur round trip per cont
+    # ──────────────────────────────────────────
+
+    async def async_get_account_bundle(
+        self,
+        *,
+        self_readings_since: str | None = None,
+        payments_since: str | None = None,
+        include_payments: bool = False,
+        year: int | None = None,
+    ) -> dict | None:
+        """POST /graphql → toate colecțiile contului activ într-un singur request.
+
+        Returnează {metering_points, invoices, balances, self_readings,
+        contracts, payments} în aceleași formate ca metodele REST
+        (invoices = wrapper {invoices, balance}, balances = docs[0]),
+        sau None dacă trebuie folosit REST.
+
+        year: doar plățile din anul dat (arhiva); facturile vin nefiltrate,
+        ca în async_get_invoices.
+
+        GraphQL se dezactivează pentru acest client doar la 404/405 sau la o
+        eroare de schemă (câmp inexistent, GRAPHQL_VALIDATION_FAILED). Orice
+        altceva — erori de autorizare sau de resolver (status 200 cu errors),
+        răspuns non-JSON, colecții lipsă sau cu mai multe pagini — întoarce
+        None doar pentru ciclul curent.
+        """
+        if not self.graphql_enabled:
+            return None
+        if not await self.async_ensure_authenticated():
+            return None
+
+        selections = [
+            _graphql_selection("metering_points", _GRAPHQL_FIELDS["metering_points"]),
+            _graphql_selection("invoices", _GRAPHQL_FIELDS["invoices"]),
+            _graphql_selection("balances", _GRAPHQL_FIELDS["balances"]),
+            _graphql_selection(
+                "self_readings",
+                _GRAPHQL_FIELDS["self_readings"],
+                _delta_where(self_readings_since),
+            ),
+            _graphql_selection("contracts", _GRAPHQL_FIELDS["contracts"]),
+        ]
+        if include_payments:
+            selections.append(
+                _graphql_selection(
+                    "payments",
+                    _GRAPHQL_FIELDS["payments"],
+                    _combine_where(
+                        _delta_where(payments_since), _payments_archive_where(year)
+                    ),
+                    "-date" if year is not None else None,
+                )
+            )
+        query = "query NovaAccountBundle { " + " ".join(selections) + " }"
+
+        try:
+            resp = await self._send_authenticated(
+                "POST", URL_GRAPHQL, json_body={"query": query}
+            )
+        except Exception as err:
+            _LOGGER.debug("GraphQL indisponibil momentan (%s) — se folosește REST", err)
+            return None
+
+        if resp.status in (404, 405):
+            self._graphql_supported = False
+            _LOGGER.info(
+                "GraphQL nu e suportat de backend (status=%s) — se folosește REST",
+                resp.status,
+            )
+            return None
+
+        payload: Any = None
+        if resp.status in (200, 400):
+            try:
+                payload = await self._decode(URL_GRAPHQL, resp.body)
+            except ValueError:
+                payload = None
+        data = payload.get("data") if isinstance(payload, dict) else None
+        errors = payload.get("errors") if isinstance(payload, dict) else None
+
+        # Doar o interogare respinsă de schemă înseamnă „nesuportat”; erorile
+        # de autorizare / resolver (tot cu status 200) sunt ale ciclului curent
+        if _graphql_schema_error(errors):
+            self._graphql_supported = False
+            _LOGGER.info(
+                "GraphQL: interogare respinsă de schemă (%s) — se folosește REST",
+                _graphql_error_message(errors),
+            )
+            return None
+        if resp.status != 200:
+            _LOGGER.debug("GraphQL → %s — se folosește REST în acest ciclu", resp.status)
+            return None
+        if payload is None:
+            _LOGGER.debug("GraphQL: răspuns non-JSON — se folosește REST în acest ciclu")
+            return None
+        if errors or not isinstance(data, dict):
+            _LOGGER.debug(
+                "GraphQL a returnat erori (%s) — se folosește REST în acest ciclu",
+                _graphql_error_message(errors),
+            )
+            return None
+
+        collections: dict[str, list[dict]] = {}
+        for alias in _GRAPHQL_COLLECTIONS:
+            if alias == "payments" and not include_payments:
+                continue
+            result = data.get(alias)
+            if not isinstance(result, dict) or not isinstance(result.get("docs"), list):
+                _LOGGER.debug(
+                    "GraphQL: colecția %s lipsește — se folosește REST în acest ciclu",
+                    alias,
+                )
+                return None
+            if result.get("hasNextPage"):
+                _LOGGER.debug(
+                    "GraphQL: colecția %s are mai multe pagini — se folosește REST", alias
+                )
+                return None
+            collections[alias] = result["docs"]
+
+        if self._graphql_supported is None:
+            self._graphql_supported = True
+            _LOGGER.info("GraphQL suportat — refresh într-un singur request per cont")
+
+        balances = collections["balances"][0] if collections["balances"] else None
+        invoices = _merge_invoice_wrappers(collections["invoices"])
+        if invoices is None:
+            # Fără wrapper (cont fără facturi) — soldul vine din /balances
+            balance = {"total": 0, "prosumer": 0}
+            if isinstance(balances, dict):
+                balance = {
+                    "total": balances.get("balance", 0),
+                    "prosumer": balances.get("prosumerBalance", 0),
+                }
+            invoices = {"invoices": [], "balance": balance}
+        return {
+            "metering_points": collections["metering_points"],
+            "invoices": invoices,
+            "balances": balances,
+            "self_readings": collections["self_readings"],
+            "contracts": collections["contracts"],
+            "payments": collections.get("payments"),
+        }
 
     # ──────────────────────────────────────────
     # Acțiuni (POST)
@@ -433,21 +3337,181 @@ class NovaApiClient:
             newIndex, specificIdForUtilityType, currentIndex, unit,
             accountName, [dialCode]
         """
-        return await self._post(URL_SELF_READINGS_ADD, body=payload)
+        result = await self._post(URL_SELF_READINGS_ADD, body=payload)
+        if result:
+            # Autocitirea poate modifica date ale contului — nu servim copii vechi
+            self.invalidate_cache(crm=self._crm_viewed)
+        return result
+
+    async def async_submit_self_reading_for(self, crm: str, payload: dict) -> dict | None:
+        """Trimite autocitirea pe contul `crm`, cu prioritate interactivă.
+
+        POST /self-readings/add se aplică contului vizualizat pe server, iar un
+        refresh care a cedat poarta între conturi poate fi rămas pe un cont
+        asociat — de aceea se comută explicit pe `crm` (inclusiv pe principal)
+        și se revine pe contul principal la final. Dacă switch-ul eșuează,
+        autocitirea NU se trimite (ar ajunge pe alt cont).
+        """
+        async with self.account_gate(RequestPriority.INTERACTIVE):
+            if self._crm_viewed != crm:
+                target = self._account_ref(crm)
+                if target is None or not await self.async_switch_account(target):
+                    _LOGGER.error(
+                        "Switch la contul %s eșuat — autocitirea nu a fost trimisă", crm
+                    )
+                    return None
+            try:
+                return await self.async_submit_self_reading(payload)
+            finally:
+                if self._crm_logged and self._crm_viewed != self._crm_logged:
+                    await self.async_switch_account(self._account_ref(self._crm_logged))
+
+    def _account_ref(self, crm: str) -> dict | None:
+        """Obiectul de cont pentru /accounts/switch (principal sau asociat)."""
+        if crm == self._crm_logged:
+            logged_in = self._logged_in_account or {}
+            return {
+                "accountName": logged_in.get("accountName", ""),
+                "accountNumber": logged_in.get("accountNumber", ""),
+                "accountId": logged_in.get("accountId", ""),
+            }
+        for account in self._associated_accounts:
+            if str(account.get("accountNumber", "")).strip() == crm:
+                return account
+        return None
 
     async def async_switch_account(self, account: dict) -> dict | None:
         """POST /accounts/switch — comută pe un cont asociat.
 
         Body: obiectul contului selectat (accountName, accountNumber, etc.)
+        După switch, crm_viewed_account e CRM-ul pe care îl vede serverul —
+        cheia cache-urilor per cont.
         """
-        return await self._post(URL_SWITCH_ACCOUNT, body=account)
+        result = await self._post(URL_SWITCH_ACCOUNT, body=account)
+        if result:
+            self._set_viewed(account)
+        return result
+
+    def _set_viewed(self, account: dict) -> None:
+        """Contul vizualizat pe server după un switch reușit."""
+        crm = str(account.get("accountNumber", "")).strip()
+        if not crm:
+            return
+        self._switched_account = account if crm != self._crm_logged else None
+        if crm != self._crm_viewed:
+            self._crm_viewed = crm
+            if crm == self._crm_logged:
+                login_view = (self._user_data or {}).get("viewedAccount")
+                self._viewed_account = login_view or self._logged_in_account
+            else:
+                self._viewed_account = account
+
+    # ──────────────────────────────────────────
+    # Cache și diagnostic
+    # ──────────────────────────────────────────
+
+    def invalidate_cache(
+        self, *, endpoint: str | None = None, crm: str | None = None
+    ) -> None:
+        """Invalidează răspunsurile din cache-ul TTL (endpoint ex: "/contracts")."""
+        removed = self._response_cache.invalidate(endpoint=endpoint, crm=crm)
+        _LOGGER.debug(
+            "Cache invalidat: endpoint=%s, cont=%s, intrări=%d",
+            endpoint or "*", crm or "*", removed,
+        )
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Statistici interne ale clientului (pentru diagnostics.py)."""
+        return {
+            "response_cache": self._response_cache.stats(),
+            "conditional_cache": self._conditional_cache.stats(),
+            "graphql": self._graphql_supported if self._use_graphql else "dezactivat",
+            "projection_disabled": sorted(self._projection_disabled),
+            "where_disabled": sorted(self._where_disabled),
+            "coalesced_requests": self._coalesced_count,
+            "retries": dict(self._retry_counts),
+            "circuit_breaker": self._breaker.stats(),
+            "limiter": self._limiter.stats(),
+            "dispatcher": self._dispatcher.stats(),
+            "latency": self._latency.stats(),
+            "timeouts": {
+                endpoint: self._timeout_for(endpoint).total
+                for endpoint in self._latency.export()
+            },
+            "hedging": {
+                "enabled": self._use_hedging,
+                "eligible": self._hedge_eligible,
+                "fired": self._hedges_fired,
+                "won": self._hedges_won,
+            },
+            "decode": {
+                "decoder": (
+                    "custom" if self._json_loads is not _json_loads
+                    else "orjson" if orjson is not None else "json"
+                ),
+                "endpoints": {
+                    endpoint: {
+                        "count": int(stats["count"]),
+                        "bytes": int(stats["bytes"]),
+                        "avg_ms": round(stats["seconds"] / stats["count"] * 1000, 2),
+                        "offloaded": int(stats["offloaded"]),
+                    }
+                    for endpoint, stats in self._decode_stats.items()
+                },
+            },
+            "transfer": {
+                "accept_encoding": _ACCEPT_ENCODING,
+                "endpoints": {
+                    endpoint: {
+                        **stats,
+                        "ratio": (
+                            round(stats["wire_bytes"] / stats["body_bytes"], 3)
+                            if stats["body_bytes"] else None
+                        ),
+                    }
+                    for endpoint, stats in self._transfer_stats.items()
+                },
+                "current_refresh": dict(self._cycle_bytes),
+                "last_refresh": self._last_cycle_bytes,
+                "per_day": {day: dict(v) for day, v in self._daily_bytes.items()},
+            },
+            "token": {
+                "seconds_left": round(self.token_seconds_left()),
+                "clock_skew": round(self._clock_skew, 1),
+                "proactive_refreshes": self._proactive_refreshes,
+                "refresh_token_supported": self._refresh_supported,
+                "token_refreshes": self._token_refreshes,
+                "password_logins": self._password_logins,
+                "auth_replays": self._auth_replays,
+                "auth_failures": self._auth_failures,
+                "auth_blocked_for": max(0, round(self._auth_blocked_until - time.monotonic())),
+            },
+            "connections": (
+                self._connection_stats.stats() if self._connection_stats else None
+            ),
+            "request_phases": (
+                self._connection_stats.phase_stats() if self._connection_stats else None
+            ),
+        }
 
     # ──────────────────────────────────────────
     # Token persistence (pentru restart HA)
     # ──────────────────────────────────────────
 
+    def export_latency(self) -> dict[str, list[float]]:
+        """Latențele observate per endpoint — persistate de coordinator."""
+        return self._latency.export()
+
+    def restore_latency(self, data: Mapping[str, Any]) -> None:
+        """Restaurează latențele salvate (timeout-uri adaptive de la pornire)."""
+        self._latency.restore(data)
+
     def export_token_data(self) -> dict | None:
-        """Exportă datele de token pentru persistare."""
+        """Exportă datele minime de sesiune pentru persistare.
+
+        Conturile se reduc la referințe (accountName, accountNumber, accountId) —
+        suficient pentru numele conturilor și pentru /accounts/switch.
+        """
         if not self._access_token:
             return None
         return {
@@ -455,11 +3519,46 @@ class NovaApiClient:
             "token_expires_in": self._token_expires_in,
             "crm_logged": self._crm_logged,
             "crm_viewed": self._crm_viewed,
-            "logged_in_account": self._logged_in_account,
-            "viewed_account": self._viewed_account,
-            "associated_accounts": self._associated_accounts,
+            "logged_in_account": _account_ref(self._logged_in_account),
+            "viewed_account": _account_ref(self._viewed_account),
+            "associated_accounts": [
+                _account_ref(account) for account in self._associated_accounts or []
+            ],
             "obtained_at_wall": time.time() - (time.monotonic() - self._token_obtained_at),
+            "refresh_supported": self._refresh_supported,
+        }
+
+    def export_session(self) -> dict | None:
+        """Snapshot complet al sesiunii: token + cookie-uri backend + skew ceas.
+
+        Persistat de coordinator într-un Store dedicat, restaurat la pornire
+        înainte de primul refresh (zero apeluri de autentificare la restart).
+        """
+        token_data = self.export_token_data()
+        if token_data is None:
+            return None
+        cookies = [
+            {"name": morsel.key, "value": morsel.value}
+            for morsel in self._session.cookie_jar.filter_cookies(URL(API_BASE)).values()
+        ]
+        return {**token_data, "clock_skew": self._clock_skew, "cookies": cookies}
+
+    def restore_session(self, snapshot: Mapping[str, Any]) -> bool:
+        """Restaurează un snapshot din export_session. True dacă avea token."""
+        if not snapshot.get("access_token"):
+            return False
+        self.inject_token(dict(snapshot))
+        skew = snapshot.get("clock_skew")
+        if isinstance(skew, (int, float)):
+            self._clock_skew = float(skew)
+        cookies = {
+            cookie["name"]: cookie["value"]
+            for cookie in snapshot.get("cookies") or []
+            if isinstance(cookie, dict) and cookie.get("name")
         }
+        if cookies:
+            self._session.cookie_jar.update_cookies(cookies, response_url=URL(API_BASE))
+        return True
 
     def inject_token(self, token_data: dict) -> None:
         """Restaurează un token salvat anterior."""
@@ -470,6 +3569,7 @@ class NovaApiClient:
         self._logged_in_account = token_data.get("logged_in_account")
         self._viewed_account = token_data.get("viewed_account")
         self._associated_accounts = token_data.get("associated_accounts", [])
+        self._refresh_supported = token_data.get("refresh_supported")
 
         wall = token_data.get("obtained_at_wall")
         if wall:
@@ -285,26 +285,6 @@ class TrimiteIndexButton(NovaBaseButton):
         acct_data = data.get("accounts_data", {}).get(self._crm, {})
         account_name = acct_data.get("account_name", "")
 
-        # Verificăm dacă trebuie switch la contul asociat
-        current_crm = self._coordinator.api.crm_viewed_account or ""
-        needs_switch = current_crm != self._crm
-
-        if needs_switch:
-            associated = self._coordinator.api.associated_accounts or []
-            target_account = None
-            for aa in associated:
-                if str(aa.get("accountNumber", "")).strip() == self._crm:
-                    target_account = aa
-                    break
-            if target_account:
-                _LOGGER.debug("[Nova:Button] Switch la contul %s pentru submit", self._crm)
-                await self._coordinator.api_client.async_switch_account(target_account)
-            else:
-                _LOGGER.warning(
-                    "[Nova:Button] Nu s-a găsit contul asociat %s — submit fără switch",
-                    self._crm,
-                )
-
         # Construiește payload-ul Nova
         payload = {
             "utilityType": self._utility,
@@ -325,18 +305,11 @@ class TrimiteIndexButton(NovaBaseButton):
             self._crm, self._clc_pod, series, index_value, self._utility,
         )
 
-        result = await self._coordinator.api_client.async_submit_self_reading(payload)
-
-        # Switch înapoi la contul principal
-        if needs_switch:
-            logged_in = self._coordinator.api.logged_in_account or {}
-            if logged_in:
-                _LOGGER.debug("[Nova:Button] Switch înapoi la contul principal")
-                await self._coordinator.api_client.async_switch_account({
-                    "accountName": logged_in.get("accountName", ""),
-                    "accountNumber": logged_in.get("accountNumber", ""),
-                    "accountId": logged_in.get("accountId", ""),
-                })
+        # Switch explicit pe contul butonului → submit → revenire pe principal,
+        # cu prioritate interactivă (refresh-ul în curs cedează între conturi)
+        result = await self._coordinator.api_client.async_submit_self_reading_for(
+            self._crm, payload
+        )
 
         if result:
             _LOGGER.info("[Nova:Button] Autocitire trimisă cu succes pentru %s.", series)
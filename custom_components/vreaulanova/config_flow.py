@@ -94,7 +94,6 @@ class NovaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         "username": self._username,
                         "password": self._password,
                         "update_interval": self._update_interval,
-                        "token_data": self._api.export_token_data(),
                     },
                 )
             else:
@@ -335,6 +334,8 @@ class NovaOptionsFlow(config_entries.OptionsFlow):
             update_interval = user_input.get(
                 "update_interval", DEFAULT_UPDATE_INTERVAL
             )
+            use_graphql = user_input.get("use_graphql", False)
+            use_hedging = user_input.get("use_hedging", False)
 
             session = async_get_clientsession(self.hass)
             self._api = NovaApiClient(session, username, password)
@@ -348,8 +349,11 @@ class NovaOptionsFlow(config_entries.OptionsFlow):
                     "username": username,
                     "password": password,
                     "update_interval": update_interval,
-                    "token_data": self._api.export_token_data(),
+                    "use_graphql": use_graphql,
+                    "use_hedging": use_hedging,
                 })
+                # Sesiunea trăiește în Store-ul intrării, nu în config_entry
+                new_data.pop("token_data", None)
                 self.hass.config_entries.async_update_entry(
                     self.config_entry, data=new_data
                 )
@@ -376,6 +380,12 @@ class NovaOptionsFlow(config_entries.OptionsFlow):
                     "update_interval",
                     default=current.get("update_interval", DEFAULT_UPDATE_INTERVAL),
                 ): vol.All(int, vol.Range(min=3600)),
+                vol.Optional(
+                    "use_graphql", default=current.get("use_graphql", False)
+                ): bool,
+                vol.Optional(
+                    "use_hedging", default=current.get("use_hedging", False)
+                ): bool,
             }
         )
 
@@ -9,6 +9,8 @@ DOMAIN = "vreaulanova"
 # ──────────────────────────────────────────────
 DEFAULT_UPDATE_INTERVAL = 3600      # 1 oră (secunde)
 HEAVY_UPDATE_MULTIPLIER = 6         # Heavy refresh la fiecare al 6-lea ciclu (≈6h)
+TARGETED_RETRY_DELAY = 300          # Secunde până la reîncercarea seturilor de date eșuate
+TARGETED_RETRY_MAX = 3              # Reîncercări țintite per ciclu, apoi se așteaptă refresh-ul
 
 # ──────────────────────────────────────────────
 # Licență
@@ -27,12 +29,181 @@ DOMAIN_TOKEN_STORE = f"{DOMAIN}_token_store"
 # ──────────────────────────────────────────────
 TOKEN_REFRESH_THRESHOLD = 300       # Refresh cu 5 min înainte de expirare
 TOKEN_MAX_AGE = 2592000             # JWT Nova expiră la 30 zile (exp din răspuns)
+TOKEN_PROACTIVE_REFRESH = 900       # Reînnoire în fundal cu 15 min înainte de expirare
+TOKEN_MANAGER_RETRY = 60            # Secunde între încercări dacă reînnoirea eșuează
+TOKEN_MANAGER_MAX_SLEEP = 3600      # Re-evaluare cel puțin orar (token injectat / înlocuit)
+AUTH_FAILURE_LIMIT = 3              # Eșecuri 401/403 consecutive până la pauza de re-autentificare
+AUTH_BACKOFF_BASE = 60              # Secunde — prima pauză, dublată la fiecare eșec nou
+AUTH_BACKOFF_MAX = 3600             # Secunde — pauza maximă
 
 # ──────────────────────────────────────────────
 # Timeout API (secunde)
 # ──────────────────────────────────────────────
 API_TIMEOUT = 30
 
+# ──────────────────────────────────────────────
+# Cache GET condițional (ETag / If-Modified-Since)
+# ──────────────────────────────────────────────
+CONDITIONAL_CACHE_MAX_BYTES = 4 * 1024 * 1024   # 4 MiB corpuri brute, evacuare LRU
+
+# ──────────────────────────────────────────────
+# Cache TTL pentru date care se schimbă rar
+# ──────────────────────────────────────────────
+# Cheie: endpoint relativ la API_BASE (ID-urile → {id}). Valoare: TTL în secunde.
+RESPONSE_CACHE_TTL: dict[str, int] = {
+    "/globals/app-info/general": 3 * 3600,    # fereastra de autocitire se deschide rar
+    "/contracts": 24 * 3600,
+    "/contracts/invoice-delivery-type": 24 * 3600,
+    "/metering-points/{id}/consumption-agreements": 24 * 3600,
+}
+# Endpoint-uri care nu depind de contul activ (o singură intrare pentru toate conturile)
+RESPONSE_CACHE_GLOBAL = frozenset({"/globals/app-info/general"})
+RESPONSE_CACHE_MAX_BYTES = 2 * 1024 * 1024      # 2 MiB, evacuare LRU
+
+# ──────────────────────────────────────────────
+# Retry (backoff exponențial cu full jitter)
+# ──────────────────────────────────────────────
+RETRY_MAX_ATTEMPTS = 3              # Încercări totale implicite per request
+RETRY_BASE_DELAY = 0.5              # Secunde — plafonul jitter-ului la prima reîncercare
+RETRY_MAX_DELAY = 15.0              # Secunde — plafon backoff / Retry-After acceptat
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Încercări per endpoint (relativ la API_BASE) — suprascriu valoarea implicită
+RETRY_ENDPOINT_ATTEMPTS: dict[str, int] = {
+    "/accounts/login/client": 2,
+    "/graphql": 1,                  # fallback-ul la REST e deja recuperarea
+    "/self-readings/add": 2,        # doar erori de conexiune înainte de trimitere
+}
+# POST-uri sigure de repetat (rezultatul nu depinde de câte ori sunt trimise)
+RETRY_IDEMPOTENT_POSTS = frozenset({
+    "/accounts/login/client",
+    "/accounts/refresh-token",
+    "/accounts/switch",
+    "/graphql",
+})
+
+# ──────────────────────────────────────────────
+# Circuit breaker (backend.nova-energy.ro)
+# ──────────────────────────────────────────────
+BREAKER_FAILURE_THRESHOLD = 5       # Eșecuri consecutive (rețea / 5xx) până la deschidere
+BREAKER_RECOVERY_TIMEOUT = 120      # Secunde cu circuitul deschis înainte de probă
+
+# ──────────────────────────────────────────────
+# Limitator de concurență AIMD (partajat între intrări)
+# ──────────────────────────────────────────────
+LIMITER_DATA_KEY = f"{DOMAIN}_limiter"
+LIMITER_INITIAL = 4                 # Request-uri simultane la pornire
+LIMITER_MIN = 1
+LIMITER_MAX = 12
+LIMITER_LATENCY_TARGET = 2.0        # Secunde — peste țintă fereastra nu mai crește
+LIMITER_DECREASE_COOLDOWN = 1.0     # Secunde între două înjumătățiri consecutive
+LIMITER_INTERACTIVE_HEADROOM = 1    # Locuri peste fereastră pentru request-urile interactive
+
+# ──────────────────────────────────────────────
+# Latențe observate + hedging pentru GET-uri lente
+# ──────────────────────────────────────────────
+LATENCY_WINDOW = 100                # Eșantioane păstrate per endpoint
+LATENCY_MIN_SAMPLES = 20            # Sub acest număr nu se calculează percentile
+HEDGE_MIN_DELAY = 0.3               # Secunde — hedge-ul nu pleacă mai devreme de atât
+HEDGE_BUDGET_RATIO = 0.05           # Cel mult 5% request-uri suplimentare
+# Endpoint-uri GET (idempotente) pentru care se face hedging — doar cu
+# opțiunea use_hedging (implicit dezactivată: trafic suplimentar în coada lentă)
+# /self-readings și /payments: doar citirile delta (paginate) au hedging —
+# descărcările complete se citesc în flux, unde hedging-ul nu se aplică
+HEDGE_ENDPOINTS = frozenset({
+    "/metering-points",
+    "/metering-points/self-readings",
+    "/metering-points/{id}/consumption-agreements",
+    "/invoices",
+    "/balances",
+    "/self-readings",
+    "/payments",
+})
+
+# ──────────────────────────────────────────────
+# Timeout-uri adaptive per endpoint (din latențele observate)
+# ──────────────────────────────────────────────
+TIMEOUT_P99_MULTIPLIER = 3.0        # timeout = p99 × k
+TIMEOUT_FLOOR = 5.0                 # Secunde — minim, indiferent de p99
+TIMEOUT_CEILING = float(API_TIMEOUT)  # Secunde — maxim (valoarea implicită)
+LATENCY_STORAGE_VERSION = 1
+LATENCY_STORAGE_KEY = DOMAIN + ".{entry_id}.latency"
+LATENCY_SAVE_DELAY = 60             # Secunde — scrierea pe disc se grupează
+SESSION_STORAGE_VERSION = 1
+SESSION_STORAGE_KEY = DOMAIN + ".{entry_id}.session"
+SESSION_SAVE_DELAY = 10             # Secunde — snapshot-ul sesiunii se scrie grupat
+
+# ──────────────────────────────────────────────
+# Sesiune HTTP dedicată (pool, DNS cache, pre-încălzire)
+# ──────────────────────────────────────────────
+CONN_LIMIT_PER_HOST = 8             # Conexiuni simultane către backend, per intrare
+CONN_KEEPALIVE_TIMEOUT = 60         # Secunde — conexiunile libere rămân deschise
+CONN_DNS_CACHE_TTL = 600            # Secunde — cache DNS în TCPConnector
+CONN_PREWARM_LEAD = 15              # Secunde înainte de refresh — se deschide conexiunea
+
+# ──────────────────────────────────────────────
+# Instrumentare faze request (TraceConfig)
+# ──────────────────────────────────────────────
+TRACE_WINDOW = 500                  # Eșantioane păstrate per fază (fereastră glisantă)
+TRACE_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# ──────────────────────────────────────────────
+# Decodare JSON + limite de mărime a corpului
+# ──────────────────────────────────────────────
+DECODE_EXECUTOR_THRESHOLD = 256 * 1024  # Octeți — corpurile mai mari se decodează în executor
+STREAM_CHUNK_SIZE = 64 * 1024           # Octeți citiți per bucată
+TRANSFER_DAYS_KEPT = 7                  # Zile păstrate în totalurile de trafic (diagnostic)
+BODY_MAX_BYTES_DEFAULT = 4 * 1024 * 1024  # Octeți — peste limită răspunsul e respins
+# Limite per endpoint (colecțiile cu istoric lung pot fi mai mari)
+BODY_MAX_BYTES: dict[str, int] = {
+    "/globals/app-info/general": 512 * 1024,
+    "/balances": 512 * 1024,
+    "/accounts/login/client": 1024 * 1024,
+    "/invoices": 16 * 1024 * 1024,
+    "/self-readings": 16 * 1024 * 1024,
+    "/payments": 16 * 1024 * 1024,
+    "/graphql": 32 * 1024 * 1024,
+}
+
+# ──────────────────────────────────────────────
+# Paginare Payload CMS (hasNextPage / nextPage)
+# ──────────────────────────────────────────────
+API_PAGE_SIZE = 100                 # Documente per pagină (parametrul limit)
+API_MAX_PAGES = 50                  # Plafon de siguranță — evită bucle infinite
+
+# ──────────────────────────────────────────────
+# Proiecție câmpuri (Payload select + depth)
+# ──────────────────────────────────────────────
+# Per endpoint: câmpurile consumate efectiv de coordinator/senzori/butoane.
+# depth=0 → relațiile rămân ID-uri; depth=1 pentru metering-points, unde
+# meters[] și gasRevisions[] sunt citite de senzori.
+API_FIELD_PROJECTIONS: dict[str, dict] = {
+    "/metering-points": {
+        "depth": 1,
+        "fields": (
+            "meteringPointId", "number", "utilityType", "specificIdForUtilityType",
+            "contractId", "meters", "gasRevisions",
+        ),
+    },
+    "/self-readings": {
+        "depth": 0,
+        "fields": (
+            "id", "updatedAt", "meterSeries", "lastSelfReadingDate",
+            "consumptionOldIndex", "consumptionNewIndex", "consumption",
+        ),
+    },
+    "/contracts": {
+        "depth": 0,
+        "fields": (
+            "contractId", "number", "utilityType", "status", "type", "signedAt",
+            "inForceAt", "invoiceDeliveryType", "prosumerContract",
+        ),
+    },
+    "/payments": {
+        "depth": 0,
+        "fields": ("id", "updatedAt", "date", "totalAmount"),
+    },
+}
+
 # ──────────────────────────────────────────────
 # URL-uri API — Backend Payload CMS
 # ──────────────────────────────────────────────
@@ -44,6 +215,7 @@ URL_LOGIN = f"{API_BASE}/accounts/login/client"
 URL_LOGOUT = f"{API_BASE}/accounts/logout"
 URL_ME = f"{API_BASE}/accounts/me"
 URL_SWITCH_ACCOUNT = f"{API_BASE}/accounts/switch"
+URL_REFRESH_TOKEN = f"{API_BASE}/accounts/refresh-token"   # Payload CMS: reînnoire JWT
 
 # App info (selfReadingsEnabled, selfReadingIntervalMessage)
 URL_APP_INFO = f"{API_BASE}/globals/app-info/general"
@@ -73,6 +245,9 @@ URL_PAYMENTS = f"{API_BASE}/payments"
 # Accounts users
 URL_ACCOUNTS_USERS = f"{API_BASE}/accounts-users"
 
+# GraphQL (Payload CMS) — opțional, cu fallback la REST
+URL_GRAPHQL = f"{API_BASE}/graphql"
+
 # ──────────────────────────────────────────────
 # Headers HTTP
 # ──────────────────────────────────────────────
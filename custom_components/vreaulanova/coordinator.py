@@ -7,6 +7,20 @@ pentru TOATE conturile (principal + asociate) via switch automat:
   2. Fetch date pentru contul vizualizat (primary)
   3. Switch la fiecare cont asociat → fetch date → switch înapoi
 
+Dacă GraphQL e activat din opțiuni și backend-ul îl suportă, colecțiile
+unui cont vin într-un singur request (fallback automat la REST).
+
+Sincronizare delta: plățile și autocitirile se cer doar de la ultimul
+updatedAt văzut (high-water mark per cont și set de date), iar rezultatul
+se combină cu listele din ciclul anterior. La heavy refresh se descarcă
+totul din nou (prinde și documentele șterse pe server). Facturile se cer
+mereu complet: /invoices întoarce un wrapper {invoices[], balance}, deci
+updatedAt-ul filtrat e al wrapper-ului, nu al facturilor.
+
+Fiecare set de date vine ca ApiResult: un set eșuat (eroare tranzitorie
+sau de autentificare) își păstrează valoarea din ciclul anterior — nu e
+înlocuit cu o listă goală — și e reîncercat țintit după TARGETED_RETRY_DELAY.
+
 Structura returnată:
   {
       "accounts_data": {
@@ -23,17 +37,102 @@ Structura returnată:
 
 import asyncio
 import logging
+from collections.abc import Callable
 from datetime import datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import NovaApiClient
-from .const import DEFAULT_UPDATE_INTERVAL, DOMAIN, HEAVY_UPDATE_MULTIPLIER, LICENSE_DATA_KEY, MONTHS_EN
+from .api import ApiResult, NovaApiClient, RequestPriority, ResultStatus
+from .const import (
+    CONN_PREWARM_LEAD,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    HEAVY_UPDATE_MULTIPLIER,
+    LATENCY_SAVE_DELAY,
+    LATENCY_STORAGE_KEY,
+    LATENCY_STORAGE_VERSION,
+    LICENSE_DATA_KEY,
+    MONTHS_EN,
+    SESSION_SAVE_DELAY,
+    SESSION_STORAGE_KEY,
+    SESSION_STORAGE_VERSION,
+    TARGETED_RETRY_DELAY,
+    TARGETED_RETRY_MAX,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seturi de date sincronizate incremental → câmpuri de identitate (în ordinea preferinței)
+_DELTA_KEYS: dict[str, tuple[str, ...]] = {
+    "payments": ("id", "paymentId"),
+    "self_readings": ("id",),
+}
+
+
+def _doc_key(doc: dict, key_fields: tuple[str, ...]) -> tuple | None:
+    """Cheia de identitate a unui document (None dacă lipsește)."""
+    for field_name in key_fields:
+        value = doc.get(field_name)
+        if value:
+            return (field_name, value)
+    return None
+
+
+def _merge_delta(previous: list[dict], updated: list[dict], key_fields: tuple[str, ...]) -> list[dict]:
+    """Combină documentele modificate cu lista din ciclul anterior.
+
+    Un document deja cunoscut e înlocuit pe poziția lui — ordinea serverului
+    se păstrează, iar senzorii care citesc primul element („cel mai recent”)
+    nu se schimbă când e editat un document vechi. Documentele noi (create
+    după ultima sincronizare) ajung primele, în ordinea serverului.
+    """
+    if not updated:
+        return previous
+    by_key: dict[tuple, dict] = {}
+    new_docs: list[dict] = []
+    for doc in updated:
+        key = _doc_key(doc, key_fields)
+        if key is None:
+            new_docs.append(doc)
+        else:
+            by_key[key] = doc
+    merged: list[dict] = []
+    for doc in previous:
+        key = _doc_key(doc, key_fields)
+        merged.append(by_key.pop(key, doc) if key is not None else doc)
+    fresh = [doc for doc in updated if _doc_key(doc, key_fields) in by_key]
+    return new_docs + fresh + merged
+
+
+def _set_mark(marks: dict[str, str], dataset: str, mark: str | None) -> None:
+    """Actualizează high-water mark-ul; fără updatedAt → sincronizare completă."""
+    if mark:
+        marks[dataset] = mark
+    else:
+        marks.pop(dataset, None)
+
+
+def _max_updated_at(docs: list[dict], current: str | None = None) -> str | None:
+    """Cel mai recent updatedAt din listă (ISO 8601 — comparabil lexicografic)."""
+    mark = current
+    for doc in docs:
+        value = doc.get("updatedAt")
+        if isinstance(value, str) and value and (mark is None or value > mark):
+            mark = value
+    return mark
+
+
+def _index_by(docs: list[dict], field_name: str) -> dict[str, list[dict]]:
+    """Grupează documentele după valoarea unui câmp."""
+    index: dict[str, list[dict]] = {}
+    for doc in docs:
+        index.setdefault(doc.get(field_name, ""), []).append(doc)
+    return index
+
 
 class NovaCoordinator(DataUpdateCoordinator):
     """Coordinator unic per cont Nova Power & Gas."""
@@ -55,7 +154,88 @@ class NovaCoordinator(DataUpdateCoordinator):
         self.api_client = api_client  # Alias — button.py îl referă ca api_client
         self.config_entry = config_entry
         self._refresh_count: int = 0
+        # High-water mark updatedAt per cont și set de date (sincronizare delta)
+        self._sync_marks: dict[str, dict[str, str]] = {}
+        # Latențele observate de client (timeout-uri adaptive) — persistate per entry
+        self._latency_store: Store = Store(
+            hass,
+            LATENCY_STORAGE_VERSION,
+            LATENCY_STORAGE_KEY.format(entry_id=config_entry.entry_id),
+        )
+        # Snapshot-ul sesiunii (token, cookie-uri, skew) — persistat per entry
+        self._session_store: Store = Store(
+            hass,
+            SESSION_STORAGE_VERSION,
+            SESSION_STORAGE_KEY.format(entry_id=config_entry.entry_id),
+        )
         self._last_persisted_token: str | None = None
+        # Timer pentru deschiderea conexiunii înainte de următorul refresh
+        self._cancel_prewarm: Callable[[], None] | None = None
+        # Seturi de date eșuate per cont → reîncercare țintită, doar pentru ele
+        self._failed_datasets: dict[str, set[str]] = {}
+        self._retry_attempts = 0
+        self._cancel_retry: Callable[[], None] | None = None
+
+    def _schedule_prewarm(self) -> None:
+        """Programează deschiderea conexiunii cu CONN_PREWARM_LEAD înainte de refresh."""
+        if self._cancel_prewarm:
+            self._cancel_prewarm()
+            self._cancel_prewarm = None
+        if not self.update_interval:
+            return
+        delay = self.update_interval.total_seconds() - CONN_PREWARM_LEAD
+        if delay > 0:
+            self._cancel_prewarm = async_call_later(self.hass, delay, self._async_prewarm)
+
+    async def _async_prewarm(self, _now: datetime) -> None:
+        self._cancel_prewarm = None
+        await self.api.async_prewarm()
+
+    async def async_shutdown(self) -> None:
+        """Oprește timer-ele programate (pre-încălzire, reîncercări) la descărcare."""
+        if self._cancel_prewarm:
+            self._cancel_prewarm()
+            self._cancel_prewarm = None
+        if self._cancel_retry:
+            self._cancel_retry()
+            self._cancel_retry = None
+        await super().async_shutdown()
+
+    def start_token_manager(self) -> None:
+        """Pornește reînnoirea token-ului în fundal (oprită la descărcarea intrării)."""
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.api.async_run_token_manager(self._persist_token),
+            f"{DOMAIN}_token_manager_{self.config_entry.entry_id}",
+        )
+
+    async def async_restore_session(self) -> bool:
+        """Restaurează snapshot-ul sesiunii în client — înainte de primul refresh.
+
+        Returnează True dacă a fost restaurat un token.
+        """
+        try:
+            data = await self._session_store.async_load()
+        except Exception as err:
+            _LOGGER.debug("Snapshot sesiune ilizibil — se ignoră: %s", err)
+            return False
+        if not isinstance(data, dict) or not self.api.restore_session(data):
+            return False
+        # Token-ul restaurat e deja pe disc — nu se rescrie la primul refresh
+        self._last_persisted_token = (self.api.export_token_data() or {}).get(
+            "access_token"
+        )
+        return True
+
+    async def async_restore_latency(self) -> None:
+        """Încarcă latențele salvate în client — apelat înainte de primul refresh."""
+        try:
+            data = await self._latency_store.async_load()
+        except Exception as err:
+            _LOGGER.debug("Latențe salvate ilizibile — se pornește de la zero: %s", err)
+            return
+        if isinstance(data, dict):
+            self.api.restore_latency(data)
 
     @property
     def _is_heavy(self) -> bool:
@@ -72,32 +252,100 @@ class NovaCoordinator(DataUpdateCoordinator):
         """
         prev = self.data or {}
         prev_acct = prev.get("accounts_data", {}).get(crm, {})
+        marks = self._sync_marks.setdefault(crm, {})
+
+        def _since(dataset: str) -> str | None:
+            """High-water mark pentru delta — None înseamnă descărcare completă."""
+            if is_heavy or dataset not in prev_acct:
+                return None
+            return marks.get(dataset)
+
+        self_readings_since = _since("self_readings")
+        payments_since = _since("payments")
+
+        # Arhiva de plăți se filtrează pe server la anul curent. Facturile vin
+        # complete: /invoices întoarce un wrapper, iar filtrele ar lovi wrapper-ul.
+        current_year = datetime.now().year
+
+        fetch_payments = is_heavy or bool(payments_since)
+
+        # ── GraphQL (opțional): toate colecțiile într-un singur round trip ──
+        # /metering-points/self-readings e endpoint custom → rămâne REST.
+        api = self.api
+        bundle = None
+        # Rezultate REST obținute în paralel cu GraphQL — refolosite la fallback
+        prefetched: dict[str, ApiResult] = {}
+        if api.graphql_enabled:
+            bundle_result, mp_sr_result = await asyncio.gather(
+                api.async_get_account_bundle(
+                    self_readings_since=self_readings_since,
+                    payments_since=payments_since,
+                    include_payments=fetch_payments,
+                    year=current_year,
+                ),
+                api.async_call(api.async_get_metering_points_self_readings),
+                return_exceptions=True,
+            )
+            if isinstance(mp_sr_result, ApiResult):
+                prefetched["metering_points_sr"] = mp_sr_result
+            if isinstance(bundle_result, dict):
+                bundle = bundle_result
+            elif isinstance(bundle_result, Exception):
+                _LOGGER.warning("Eroare GraphQL (cont %s): %s", crm, bundle_result)
+
+        if bundle is not None:
+            results: dict[str, ApiResult] = {
+                name: ApiResult(ResultStatus.OK, bundle[key])
+                for name, key in (
+                    ("metering_points", "metering_points"),
+                    ("invoices", "invoices"),
+                    ("balances", "balances"),
+                    ("self_readings", "self_readings"),
+                    ("contracts", "contracts"),
+                )
+            }
+            results["metering_points_sr"] = prefetched.get(
+                "metering_points_sr", ApiResult(ResultStatus.TRANSIENT_ERROR)
+            )
+        else:
+            # ── Fetch paralel REST: date esențiale (fără cele deja obținute) ──
+            calls = {
+                "metering_points": api.async_call(api.async_get_metering_points),
+                "invoices": api.async_call(api.async_get_invoices),
+                "balances": api.async_call(api.async_get_balances),
+                "self_readings": api.async_call(
+                    api.async_get_self_readings, updated_after=self_readings_since
+                ),
+                "contracts": api.async_call(api.async_get_contracts),
+            }
+            reused = {name: res for name, res in prefetched.items() if res.usable}
+            if "metering_points_sr" not in reused:
+                calls["metering_points_sr"] = api.async_call(
+                    api.async_get_metering_points_self_readings
+                )
+            results = {
+                **reused,
+                **dict(zip(calls, await asyncio.gather(*calls.values()))),
+            }
 
-        # ── Fetch paralel: date esențiale ──
-        essential = await asyncio.gather(
-            self.api.async_get_metering_points(),
-            self.api.async_get_metering_points_self_readings(),
-            self.api.async_get_invoices(),
-            self.api.async_get_balances(),
-            self.api.async_get_self_readings(),
-            self.api.async_get_contracts(),
-            return_exceptions=True,
-        )
+        # Seturile eșuate își păstrează datele din ciclul anterior
+        failed = {name for name, result in results.items() if not result.usable}
+        for name in sorted(failed):
+            _LOGGER.warning(
+                "Eroare la %s (cont %s): %s — se păstrează datele anterioare",
+                name, crm, results[name].status,
+            )
 
-        labels = [
-            "metering_points", "metering_points_sr",
-            "invoices", "balances", "self_readings", "contracts",
-        ]
-        mp_primary = essential[0] if not isinstance(essential[0], Exception) else []
-        mp_self_readings = essential[1] if not isinstance(essential[1], Exception) else []
-        invoices_raw = essential[2] if not isinstance(essential[2], Exception) else None
-        balances_raw = essential[3] if not isinstance(essential[3], Exception) else None
-        self_readings = essential[4] if not isinstance(essential[4], Exception) else []
-        contracts = essential[5] if not isinstance(essential[5], Exception) else []
-
-        for i, label in enumerate(labels):
-            if isinstance(essential[i], Exception):
-                _LOGGER.warning("Eroare la %s (cont %s): %s", label, crm, essential[i])
+        mp_primary = results["metering_points"].data or []
+        mp_self_readings = results["metering_points_sr"].data or []
+        invoices_result = results["invoices"]
+        balances_raw = results["balances"].data if "balances" not in failed else None
+        self_readings = results["self_readings"].data or []
+        contracts = (
+            results["contracts"].data or []
+            if "contracts" not in failed
+            else prev_acct.get("contracts", [])
+        )
 
         # ── Merge metering points: /metering-points + /metering-points/self-readings ──
         # /self-readings poate conține MP-uri extra (ex: LC vechi) sau meters populate
@@ -106,16 +354,23 @@ class NovaCoordinator(DataUpdateCoordinator):
         seen_mp_ids = {
             mp.get("meteringPointId") for mp in metering_points if mp.get("meteringPointId")
         }
+        if failed & {"metering_points", "metering_points_sr"} and prev_acct.get(
+            "metering_points"
+        ):
+            # Lista combinată nu poate fi reconstruită corect — rămâne cea anterioară
+            metering_points = list(prev_acct["metering_points"])
+            mp_self_readings = []
 
         for sr_mp in mp_self_readings:
             sr_id = sr_mp.get("meteringPointId", "")
 
             if sr_id in seen_mp_ids:
                 # MP există deja — merge meters dacă primary are meters gol
-                for existing_mp in metering_points:
+                for idx, existing_mp in enumerate(metering_points):
                     if existing_mp.get("meteringPointId") == sr_id:
                         if not existing_mp.get("meters") and sr_mp.get("meters"):
-                            existing_mp["meters"] = sr_mp["meters"]
+                            # Copie — documentul e partajat cu cache-ul HTTP al clientului
+                            metering_points[idx] = {**existing_mp, "meters": sr_mp["meters"]}
                             _LOGGER.debug(
                                 "Merge meters din /self-readings pentru MP %s",
                                 existing_mp.get("number", sr_id),
@@ -151,29 +406,63 @@ class NovaCoordinator(DataUpdateCoordinator):
                 if mp_id:
                     mp_ids.append(mp_id)
                     agreement_tasks.append(
-                        self.api.async_get_consumption_agreement(mp_id)
+                        api.async_call(api.async_get_consumption_agreement, mp_id)
                     )
 
             if agreement_tasks:
-                results = await asyncio.gather(*agreement_tasks, return_exceptions=True)
-                for mp_id, result in zip(mp_ids, results):
-                    if isinstance(result, Exception):
+                prev_agreements = prev_acct.get("agreements", {})
+                agreement_results = await asyncio.gather(*agreement_tasks)
+                for mp_id, result in zip(mp_ids, agreement_results):
+                    if not result.usable:
                         _LOGGER.warning(
-                            "Eroare agreement %s (cont %s): %s", mp_id, crm, result
+                            "Eroare agreement %s (cont %s): %s", mp_id, crm, result.status
                         )
-                    elif result:
-                        agreements[mp_id] = result
+                        failed.add("agreements")
+                        if mp_id in prev_agreements:
+                            agreements[mp_id] = prev_agreements[mp_id]
+                    elif result.data:
+                        agreements[mp_id] = result.data
+
+        # ── Payments: complet la heavy refresh, delta la light (dacă avem mark) ──
+        fetched_payments: list[dict] = []
+        if fetch_payments:
+            if bundle is not None and bundle.get("payments") is not None:
+                fetched_payments = bundle["payments"]
+            else:
+                payments_result = await api.async_call(
+                    api.async_get_payments, updated_after=payments_since, year=current_year
+                )
+                if payments_result.usable:
+                    fetched_payments = payments_result.data or []
+                else:
+                    _LOGGER.warning(
+                        "Eroare la payments (cont %s): %s — se păstrează datele anterioare",
+                        crm, payments_result.status,
+                    )
+                    failed.add("payments")
 
-        # ── Payments (doar la heavy refresh) ──
-        if is_heavy:
-            payments = await self.api.async_get_payments()
+        if "payments" in failed:
+            payments = prev_acct.get("payments", [])
+        elif is_heavy:
+            payments = fetched_payments
+            _set_mark(marks, "payments", _max_updated_at(payments))
+        elif payments_since:
+            payments = _merge_delta(
+                prev_acct.get("payments", []), fetched_payments, _DELTA_KEYS["payments"]
+            )
+            _set_mark(marks, "payments", _max_updated_at(fetched_payments, payments_since))
         else:
             payments = prev_acct.get("payments", [])
 
         # ── Procesare invoices ──
+        invoices_raw = invoices_result.data
         invoices = []
         balance = {"total": 0, "prosumer": 0}
-        if invoices_raw and isinstance(invoices_raw, dict):
+        if "invoices" in failed:
+            # Eșec (nu „gol”) — lista și balanța rămân neschimbate
+            invoices = prev_acct.get("invoices", [])
+            balance = prev_acct.get("balance", balance)
+        elif invoices_raw and isinstance(invoices_raw, dict):
             invoices = invoices_raw.get("invoices", [])
             balance = invoices_raw.get("balance", balance)
 
@@ -184,17 +473,27 @@ class NovaCoordinator(DataUpdateCoordinator):
                 "prosumer": balances_raw.get("prosumerBalance", 0),
             }
 
-        # ── Indexare self_readings per contor ──
-        readings_by_meter = {}
-        for sr in self_readings:
-            series = sr.get("meterSeries", "")
-            readings_by_meter.setdefault(series, []).append(sr)
+        # ── Self readings: merge delta peste lista anterioară ──
+        if "self_readings" in failed:
+            self_readings = prev_acct.get("self_readings", [])
+        elif self_readings_since:
+            self_readings = _merge_delta(
+                prev_acct.get("self_readings", []),
+                self_readings,
+                _DELTA_KEYS["self_readings"],
+            )
+            _set_mark(marks, "self_readings", _max_updated_at(self_readings, self_readings_since))
+        else:
+            _set_mark(marks, "self_readings", _max_updated_at(self_readings))
+
+        # ── Indexare self_readings per contor, facturi per metering point ──
+        readings_by_meter = _index_by(self_readings, "meterSeries")
+        invoices_by_mp = _index_by(invoices, "meteringPointCode")
 
-        # ── Indexare facturi per metering point ──
-        invoices_by_mp = {}
-        for inv in invoices:
-            mp_code = inv.get("meteringPointCode", "")
-            invoices_by_mp.setdefault(mp_code, []).append(inv)
+        if failed:
+            self._failed_datasets[crm] = failed
+        else:
+            self._failed_datasets.pop(crm, None)
 
         _LOGGER.debug(
             "Fetch cont %s (%s): %d puncte, %d facturi, %d autocitiri, %d contracte",
@@ -222,6 +521,18 @@ class NovaCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self) -> dict:
         """Extrage toate datele de la API-ul Nova pentru TOATE conturile."""
+        if self._cancel_retry:
+            # Refresh-ul complet acoperă și seturile eșuate anterior
+            self._cancel_retry()
+            self._cancel_retry = None
+        self._retry_attempts = 0
+        async with self.api.account_gate(RequestPriority.REFRESH):
+            data = await self._async_update_all()
+        self._schedule_targeted_retry()
+        return data
+
+    async def _async_update_all(self) -> dict:
+        """Refresh complet — apelat cu poarta de cont deținută (prioritate REFRESH)."""
         # Verificare licență — nu fetchuim date dacă licența/trial nu e validă
         license_mgr = self.hass.data.get(DOMAIN, {}).get(LICENSE_DATA_KEY)
         if license_mgr and not license_mgr.is_valid:
@@ -229,11 +540,23 @@ class NovaCoordinator(DataUpdateCoordinator):
             return self.data or {}
 
         is_heavy = self._is_heavy
+        self.api.start_transfer_cycle()
         _LOGGER.debug(
             "Actualizare Nova (refresh=#%s, tip=%s)",
             self._refresh_count, "HEAVY" if is_heavy else "light",
         )
 
+        # Circuit breaker — cu backend-ul căzut servim ultimele date bune
+        # în loc să așteptăm timeout-uri la fiecare request
+        if self.api.circuit_state != "closed" and not await self.api.async_probe_backend():
+            if self.data:
+                _LOGGER.warning(
+                    "Backend Nova indisponibil (circuit %s) — se păstrează ultimele date",
+                    self.api.circuit_state,
+                )
+                return self.data
+            raise UpdateFailed("Backend Nova indisponibil (circuit breaker deschis)")
+
         try:
             # Asigurăm autentificarea
             if not await self.api.async_ensure_authenticated():
@@ -252,6 +575,10 @@ class NovaCoordinator(DataUpdateCoordinator):
             accounts_data: dict[str, dict] = {}
             primary_crm = self.api.crm_viewed_account or self.api.crm_logged_account or ""
             logged_crm = self.api.crm_logged_account or primary_crm
+            if primary_crm != logged_crm:
+                # O revenire eșuată anterior a lăsat serverul pe un cont asociat
+                await self._async_switch_back(logged_crm)
+                primary_crm = self.api.crm_viewed_account or logged_crm
 
             if primary_crm:
                 # Numele contului principal
@@ -279,6 +606,9 @@ class NovaCoordinator(DataUpdateCoordinator):
                     if not aa_crm or aa_crm in accounts_data:
                         continue  # Deja extras sau CRM invalid
 
+                    # Punct sigur: o trimitere de index în așteptare trece acum
+                    await self.api.async_checkpoint()
+
                     _LOGGER.debug(
                         "Switch la contul asociat: %s (%s)",
                         aa.get("accountName", "?"), aa_crm,
@@ -298,25 +628,30 @@ class NovaCoordinator(DataUpdateCoordinator):
             finally:
                 # ── Revenire la contul principal (ALWAYS — inclusiv pe excepție) ──
                 if switched and logged_crm:
-                    logged_in = self.api.logged_in_account or {}
                     _LOGGER.debug("Revenire la contul principal: %s", logged_crm)
-                    try:
-                        await self.api.async_switch_account({
-                            "accountName": logged_in.get("accountName", ""),
-                            "accountNumber": logged_in.get("accountNumber", ""),
-                            "accountId": logged_in.get("accountId", ""),
-                        })
-                    except Exception as sw_err:
-                        _LOGGER.error(
-                            "Eroare la revenirea pe contul principal %s: %s",
-                            logged_crm, sw_err,
-                        )
+                    await self._async_switch_back(logged_crm)
 
             # Incrementăm counter
             self._refresh_count += 1
 
-            # Persistăm token
+            # Circuitul s-a deschis în timpul refresh-ului — rezultatul e parțial.
+            # Păstrăm datele anterioare; reperele delta se resetează ca următorul
+            # ciclu reușit să facă sincronizare completă.
+            if self.api.circuit_state != "closed" and self.data:
+                _LOGGER.warning(
+                    "Circuit breaker deschis în timpul actualizării — "
+                    "se păstrează ultimele date"
+                )
+                self._sync_marks.clear()
+                return self.data
+
+            # Persistăm token + latențele observate (scriere grupată)
             self._persist_token()
+            self._latency_store.async_delay_save(
+                self.api.export_latency, LATENCY_SAVE_DELAY
+            )
+            self._schedule_prewarm()
+            self.api.log_refresh_trace(self._refresh_count)
 
             total_mp = sum(
                 len(a.get("metering_points", [])) for a in accounts_data.values()
@@ -353,19 +688,185 @@ class NovaCoordinator(DataUpdateCoordinator):
             _LOGGER.exception("Eroare la actualizare Nova: %s", err)
             raise UpdateFailed(f"Eroare la actualizare Nova: {err}") from err
 
+    # ──────────────────────────────────────────
+    # Reîncercare țintită (doar seturile de date eșuate)
+    # ──────────────────────────────────────────
+
+    def _schedule_targeted_retry(self) -> None:
+        """Programează reîncercarea seturilor eșuate, dacă există și mai avem încercări."""
+        if self._cancel_retry:
+            self._cancel_retry()
+            self._cancel_retry = None
+        if not self._failed_datasets or self._retry_attempts >= TARGETED_RETRY_MAX:
+            return
+        self._cancel_retry = async_call_later(
+            self.hass, TARGETED_RETRY_DELAY, self._async_retry_failed
+        )
+
+    async def _async_retry_failed(self, _now: datetime) -> None:
+        self._cancel_retry = None
+        self._retry_attempts += 1
+        if not self.data or self.api.circuit_state != "closed":
+            self._schedule_targeted_retry()
+            return
+
+        pending = list(self._failed_datasets)
+        logged_crm = self.api.crm_logged_account or ""
+        primary_crm = logged_crm or self.api.crm_viewed_account or ""
+        associated = {
+            str(aa.get("accountNumber", "")).strip(): aa
+            for aa in self.api.associated_accounts or []
+        }
+        _LOGGER.debug("Reîncercare țintită #%d: conturi %s", self._retry_attempts, pending)
+
+        refreshed = False
+        async with self.api.account_gate(RequestPriority.BACKFILL):
+            for crm in pending:
+                # Punct sigur (sesiunea e pe contul principal): refresh-ul sau o
+                # trimitere de index în așteptare trec înainte. După cedare,
+                # datele și seturile eșuate se recitesc — pot fi deja refăcute.
+                await self.api.async_checkpoint()
+                names = self._failed_datasets.get(crm)
+                acct = (self.data or {}).get("accounts_data", {}).get(crm)
+                if not names or acct is None:
+                    self._failed_datasets.pop(crm, None)
+                    continue
+
+                switched = False
+                try:
+                    if crm != primary_crm:
+                        aa = associated.get(crm)
+                        if not aa or not await self.api.async_switch_account(aa):
+                            continue
+                        switched = True
+                    elif self.api.crm_viewed_account != primary_crm:
+                        await self._async_switch_back(logged_crm)
+                        if self.api.crm_viewed_account != primary_crm:
+                            continue
+                    acct = await self._refetch_datasets(crm, acct, set(names))
+                except Exception as err:  # noqa: BLE001
+                    _LOGGER.warning("Eroare la reîncercarea țintită (cont %s): %s", crm, err)
+                    continue
+                finally:
+                    if switched:
+                        await self._async_switch_back(logged_crm)
+
+                # Copie superficială — entitățile citesc self.data, nu îl mutăm pe loc
+                data = self.data or {}
+                self.data = {
+                    **data,
+                    "accounts_data": {**data.get("accounts_data", {}), crm: acct},
+                }
+                refreshed = True
+
+        if refreshed:
+            self.async_update_listeners()
+        self._schedule_targeted_retry()
+
+    async def _async_switch_back(self, logged_crm: str) -> None:
+        """Revine pe contul principal după un switch (erorile doar se loghează)."""
+        logged_in = self.api.logged_in_account or {}
+        try:
+            await self.api.async_switch_account({
+                "accountName": logged_in.get("accountName", ""),
+                "accountNumber": logged_in.get("accountNumber", ""),
+                "accountId": logged_in.get("accountId", ""),
+            })
+        except Exception as sw_err:  # noqa: BLE001
+            _LOGGER.error(
+                "Eroare la revenirea pe contul principal %s: %s", logged_crm, sw_err
+            )
+
+    async def _refetch_datasets(self, crm: str, acct: dict, names: set[str]) -> dict:
+        """Descarcă din nou (complet, fără delta) doar seturile din `names`.
+
+        Setul rămâne în _failed_datasets dacă eșuează din nou. Punctele de
+        măsurare nu se reîncearcă aici — lista lor se reface la refresh-ul complet.
+        """
+        api = self.api
+        acct = dict(acct)
+        marks = self._sync_marks.setdefault(crm, {})
+        current_year = datetime.now().year
+        still_failed = set(names) & {"metering_points", "metering_points_sr"}
+
+        async def _retry(name: str, getter, *args, **kwargs) -> ApiResult | None:
+            if name not in names:
+                return None
+            result = await api.async_call(getter, *args, **kwargs)
+            if not result.usable:
+                still_failed.add(name)
+                return None
+            return result
+
+        invoices = await _retry("invoices", api.async_get_invoices)
+        if invoices is not None:
+            raw = invoices.data if isinstance(invoices.data, dict) else {}
+            acct["invoices"] = raw.get("invoices", [])
+            acct["invoices_by_mp"] = _index_by(acct["invoices"], "meteringPointCode")
+            if "balances" not in names and raw.get("balance") is not None:
+                acct["balance"] = raw["balance"]
+
+        balances = await _retry("balances", api.async_get_balances)
+        if balances is not None and isinstance(balances.data, dict):
+            acct["balance"] = {
+                "total": balances.data.get("balance", 0),
+                "prosumer": balances.data.get("prosumerBalance", 0),
+            }
+
+        self_readings = await _retry("self_readings", api.async_get_self_readings)
+        if self_readings is not None:
+            acct["self_readings"] = self_readings.data or []
+            acct["readings_by_meter"] = _index_by(acct["self_readings"], "meterSeries")
+            _set_mark(marks, "self_readings", _max_updated_at(acct["self_readings"]))
+
+        contracts = await _retry("contracts", api.async_get_contracts)
+        if contracts is not None:
+            acct["contracts"] = contracts.data or []
+
+        payments = await _retry("payments", api.async_get_payments, year=current_year)
+        if payments is not None:
+            acct["payments"] = payments.data or []
+            _set_mark(marks, "payments", _max_updated_at(acct["payments"]))
+
+        if "agreements" in names:
+            agreements = dict(acct.get("agreements", {}))
+            for mp in acct.get("metering_points", []):
+                mp_id = mp.get("meteringPointId")
+                if not mp_id:
+                    continue
+                result = await api.async_call(api.async_get_consumption_agreement, mp_id)
+                if not result.usable:
+                    still_failed.add("agreements")
+                elif result.data:
+                    agreements[mp_id] = result.data
+            acct["agreements"] = agreements
+
+        if still_failed:
+            self._failed_datasets[crm] = still_failed
+        else:
+            self._failed_datasets.pop(crm, None)
+        _LOGGER.debug(
+            "Reîncercare cont %s: %s refăcute, %s încă eșuate",
+            crm, sorted(names - still_failed), sorted(still_failed),
+        )
+        return acct
+
     def _persist_token(self) -> None:
-        """Salvează token-ul în config_entry doar dacă s-a schimbat."""
+        """Programează salvarea sesiunii în Store-ul intrării.
+
+        async_delay_save grupează scrierile (rotația token-ului nu mai rescrie
+        .storage/core.config_entries și nu declanșează listener-ele intrării).
+        Se salvează doar dacă token-ul s-a schimbat de la ultima salvare.
+        """
         token_data = self.api.export_token_data()
-        if not token_data or not self.config_entry:
+        if not token_data:
             return
-
         current_token = token_data.get("access_token")
         if current_token == self._last_persisted_token:
-            return  # Nu s-a schimbat — evităm scrieri inutile
-
-        new_data = dict(self.config_entry.data)
-        new_data["token_data"] = token_data
-        self.hass.config_entries.async_update_entry(
-            self.config_entry, data=new_data
-        )
+            return
+        self._session_store.async_delay_save(self._session_snapshot, SESSION_SAVE_DELAY)
         self._last_persisted_token = current_token
+
+    def _session_snapshot(self) -> dict:
+        """Datele scrise de Store (async_delay_save cere un dict)."""
+        return self.api.export_session() or {}
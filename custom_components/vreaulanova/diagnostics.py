@@ -4,6 +4,7 @@ Diagnosticare pentru integrarea Nova Power & Gas (Vreau la Nova).
 Exportă informații de diagnostic pentru support tickets:
 - Licență (fingerprint, status, cheie mascată)
 - Starea coordinator-ului
+- Statistici client API (cache-uri, transport, faze request)
 - Senzori, butoane, senzori binari activi
 
 Datele sensibile (parolă, token-uri) sunt excluse.
@@ -55,6 +56,11 @@ async def async_get_config_entry_diagnostics(
         coordinator_info["invoices_count"] = len(data.get("invoices", []))
         coordinator_info["contracts_count"] = len(data.get("contracts", []))
 
+    # ── Client API (cache-uri, transport) ──
+    client_api_info: dict[str, Any] = {}
+    if runtime and getattr(runtime, "api_client", None):
+        client_api_info = runtime.api_client.diagnostics()
+
     # ── Senzori activi ──
     senzori_activi = sorted(
         entitate.entity_id
@@ -87,6 +93,7 @@ async def async_get_config_entry_diagnostics(
         },
         "licenta": licenta_info,
         "coordinator": coordinator_info,
+        "client_api": client_api_info,
         "stare": {
             "senzori_activi": len(senzori_activi),
             "lista_senzori": senzori_activi,
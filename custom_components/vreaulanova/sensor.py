@@ -465,7 +465,12 @@ class NovaArhivaPlatiSensor(NovaBaseSensor):
         self._custom_entity_id = f"sensor.{DOMAIN}_{crm}_{self._mp_slug}_arhiva_plati"
 
     def _payments_current_year(self) -> list[dict]:
-        """Filtrează plățile pe anul curent."""
+        """Filtrează plățile pe anul curent.
+
+        Coordinator-ul cere deja doar plățile din anul curent (filtru pe server);
+        filtrul local rămâne ca plasă de siguranță (server care respinge sau
+        ignoră where, trecerea în an nou între două heavy refresh-uri).
+        """
         acct = self._account_data()
         payments = acct.get("payments", [])
         current_year = str(datetime.now().year)
@@ -0,0 +1,251 @@
+"""Fixture-uri comune: un backend Nova simulat în memorie.
+
+FakeNova imită endpoint-urile folosite de NovaApiClient (login, switch,
+colecții per cont, ETag / 304) și ține evidența contului vizualizat pe
+server — exact starea pe care clientul trebuie s-o urmărească corect.
+FakeSession expune partea din aiohttp.ClientSession folosită de client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiohttp import CookieJar
+from homeassistant.core import HomeAssistant
+from multidict import CIMultiDict
+from yarl import URL
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.vreaulanova.api import NovaApiClient  # noqa: E402
+from custom_components.vreaulanova.const import API_BASE  # noqa: E402
+
+PRIMARY = "3000001"
+ASSOCIATED = "3000002"
+ASSOCIATED_2 = "3000003"
+
+# Colecții fără date în scenariile de test (răspuns gol, nu 404; vezi FakeNova.docs)
+_EMPTY_COLLECTIONS = (
+    "/metering-points", "/metering-points/self-readings", "/self-readings",
+    "/invoices", "/payments",
+)
+
+
+class _Content:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def iter_chunked(self, size: int):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+
+class FakeResponse:
+    """Răspuns minimal compatibil cu ce citește _send_once / _read_body."""
+
+    def __init__(
+        self, status: int = 200, body: Any = None, headers: dict | None = None
+    ) -> None:
+        self.status = status
+        if isinstance(body, bytes):
+            raw = body
+        else:
+            raw = json.dumps(body).encode() if body is not None else b""
+        self.headers = CIMultiDict(headers or {})
+        self.headers.setdefault("Content-Type", "application/json")
+        self.content_length = len(raw)
+        self.content = _Content(raw)
+
+    async def __aenter__(self) -> FakeResponse:
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+class FakeNova:
+    """Backend Nova simulat: un cont principal + un cont asociat."""
+
+    def __init__(self) -> None:
+        self.viewed = PRIMARY
+        self.requests: list[tuple[str, str, str]] = []  # (metodă, cale, cont vizualizat)
+        self.delays: dict[str, float] = {}
+        # Răspunsuri programate per cale, consumate în ordine: (întârziere, status)
+        self.scripted: dict[str, list[tuple[float, int]]] = {}
+        self.queries: list[tuple[str, dict]] = []  # (cale, parametri query)
+        self.reject_where: set[str] = set()  # căi care răspund 400 la where[...]
+        self.docs: dict[str, list] = {}  # documente pentru _EMPTY_COLLECTIONS
+        self.graphql: dict | None = None  # răspunsul /graphql (None → 404)
+        self.graphql_status = 200
+        self.graphql_queries: list[str] = []
+        self.accounts = {
+            PRIMARY: {
+                "contracts": [{"id": "C-PRIMARY", "number": "C-PRIMARY"}],
+                "balance": {"balance": 10, "prosumerBalance": 0},
+            },
+            ASSOCIATED: {
+                "contracts": [{"id": "C-ASSOC", "number": "C-ASSOC"}],
+                "balance": {"balance": 99, "prosumerBalance": 0},
+            },
+            ASSOCIATED_2: {
+                "contracts": [{"id": "C-ASSOC-2", "number": "C-ASSOC-2"}],
+                "balance": {"balance": 7, "prosumerBalance": 0},
+            },
+        }
+        self.self_readings_added: list[tuple[str, dict]] = []
+        self.not_modified = 0
+
+    @staticmethod
+    def account(crm: str, name: str) -> dict:
+        return {"accountNumber": crm, "accountName": name, "accountId": f"id-{crm}"}
+
+    def login_payload(self) -> dict:
+        primary = {
+            **self.account(PRIMARY, "Principal"),
+            "associatedAccounts": [
+                self.account(ASSOCIATED, "Asociat"),
+                self.account(ASSOCIATED_2, "Asociat 2"),
+            ],
+        }
+        return {
+            "data": {
+                "loggedInAccount": primary,
+                "viewedAccount": self.account(PRIMARY, "Principal"),
+                "session": {"token": "tok", "expireAt": time.time() + 86400},
+            }
+        }
+
+    async def handle(
+        self, method: str, url: str, headers: dict, params: dict | None, body: Any
+    ) -> FakeResponse:
+        path = str(URL(url).path)[len(URL(API_BASE).path):]
+        viewed = self.viewed  # contul vizualizat la sosirea request-ului
+        self.requests.append((method, path, viewed))
+        self.queries.append((path, dict(params or {})))
+        delay = self.delays.get(path)
+        status = 200
+        if self.scripted.get(path):
+            delay, status = self.scripted[path].pop(0)
+        if delay:
+            await asyncio.sleep(delay)
+        if status != 200:
+            return FakeResponse(status, {})
+
+        if path == "/accounts/login/client":
+            self.viewed = PRIMARY
+            return FakeResponse(200, self.login_payload())
+        if path == "/accounts/refresh-token":
+            return FakeResponse(404, {})
+        if path == "/accounts/switch":
+            self.viewed = str(body.get("accountNumber"))
+            return FakeResponse(200, {"ok": True})
+        if path == "/graphql":
+            self.graphql_queries.append(body.get("query", ""))
+            if self.graphql is None:
+                return FakeResponse(404, {})
+            return FakeResponse(self.graphql_status, self.graphql)
+        if path == "/self-readings/add":
+            self.self_readings_added.append((self.viewed, body))
+            return FakeResponse(200, {"ok": True})
+
+        if path in self.reject_where and any(k.startswith("where[") for k in params or {}):
+            return FakeResponse(400, {"errors": [{"message": "invalid where"}]})
+
+        data = self.accounts[viewed]
+        if path == "/balances":
+            etag = f'"bal-{viewed}-{data["balance"]["balance"]}"'
+            if headers.get("If-None-Match") == etag:
+                self.not_modified += 1
+                return FakeResponse(304, b"", {"ETag": etag})
+            return FakeResponse(200, {"docs": [data["balance"]]}, {"ETag": etag})
+        if path in ("/contracts", "/contracts/invoice-delivery-type"):
+            return FakeResponse(
+                200, {"docs": data["contracts"], "hasNextPage": False, "totalPages": 1}
+            )
+        if path in _EMPTY_COLLECTIONS:
+            docs = self.docs.get(path, [])
+            limit = int((params or {}).get("limit") or len(docs) or 1)
+            page = int((params or {}).get("page") or 1)
+            return FakeResponse(
+                200,
+                {
+                    "docs": docs[(page - 1) * limit:page * limit],
+                    "hasNextPage": page * limit < len(docs),
+                    "nextPage": page + 1,
+                },
+            )
+        if path == "/globals/app-info/general":
+            return FakeResponse(200, {"data": {"selfReadingsEnabled": True}})
+        return FakeResponse(404, {})
+
+    def count(self, path: str) -> int:
+        return sum(1 for _method, p, _viewed in self.requests if p == path)
+
+
+class FakeSession:
+    """Partea din ClientSession folosită de NovaApiClient."""
+
+    auto_decompress = True
+
+    def __init__(self, nova: FakeNova) -> None:
+        self._nova = nova
+        self.closed = False
+        self.cookie_jar = CookieJar()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict | None = None,
+        params: dict | None = None,
+        json: Any = None,
+        timeout: Any = None,
+        trace_request_ctx: Any = None,
+    ):
+        return _Pending(self._nova.handle(method, url, headers or {}, params, json))
+
+    def head(self, url: str, **_kwargs: Any):
+        return _Pending(self._nova.handle("HEAD", url, {}, None, None))
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _Pending:
+    """`async with session.request(...)` peste o corutină care produce răspunsul."""
+
+    def __init__(self, coro) -> None:
+        self._coro = coro
+
+    async def __aenter__(self) -> FakeResponse:
+        return await self._coro
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+@pytest.fixture
+def nova() -> FakeNova:
+    return FakeNova()
+
+
+@pytest_asyncio.fixture
+async def client(nova: FakeNova) -> NovaApiClient:
+    api = NovaApiClient(FakeSession(nova), "user@example.com", "secret")
+    assert await api.async_login()
+    return api
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path: Path) -> HomeAssistant:
+    instance = HomeAssistant(str(tmp_path))
+    yield instance
+    await instance.async_stop(force=True)
@@ -0,0 +1,63 @@
+"""Cache-urile per cont după comutarea pe un cont asociat."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from .conftest import ASSOCIATED, PRIMARY, FakeNova
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_switch_tracks_viewed_account(client, nova: FakeNova) -> None:
+    assert client.crm_viewed_account == PRIMARY
+
+    await client.async_switch_account(nova.account(ASSOCIATED, "Asociat"))
+    assert client.crm_viewed_account == ASSOCIATED
+    assert client.viewed_account["accountNumber"] == ASSOCIATED
+
+    await client.async_switch_account(nova.account(PRIMARY, "Principal"))
+    assert client.crm_viewed_account == PRIMARY
+
+
+async def test_response_cache_is_per_viewed_account(client, nova: FakeNova) -> None:
+    primary = await client.async_get_contracts()
+    assert [c["id"] for c in primary] == ["C-PRIMARY"]
+
+    await client.async_switch_account(nova.account(ASSOCIATED, "Asociat"))
+    associated = await client.async_get_contracts()
+    assert [c["id"] for c in associated] == ["C-ASSOC"]
+    assert nova.count("/contracts") == 2
+
+    # Înapoi pe principal: copia din cache a principalului e încă validă
+    await client.async_switch_account(nova.account(PRIMARY, "Principal"))
+    assert [c["id"] for c in await client.async_get_contracts()] == ["C-PRIMARY"]
+    assert nova.count("/contracts") == 2
+
+
+async def test_conditional_cache_is_per_viewed_account(client, nova: FakeNova) -> None:
+    assert (await client.async_get_balances())["balance"] == 10
+    assert (await client.async_get_balances())["balance"] == 10  # 304
+
+    await client.async_switch_account(nova.account(ASSOCIATED, "Asociat"))
+    assert (await client.async_get_balances())["balance"] == 99
+
+    assert [viewed for _m, path, viewed in nova.requests if path == "/balances"] == [
+        PRIMARY, PRIMARY, ASSOCIATED,
+    ]
+    assert nova.not_modified == 1  # validatorii principalului nu pleacă pe asociat
+
+
+async def test_single_flight_is_per_viewed_account(client, nova: FakeNova) -> None:
+    nova.delays["/contracts"] = 0.05
+    primary = asyncio.create_task(client.async_get_contracts())
+    await asyncio.sleep(0.01)  # GET-ul principalului e în zbor
+
+    await client.async_switch_account(nova.account(ASSOCIATED, "Asociat"))
+    associated = await client.async_get_contracts()
+
+    assert [c["id"] for c in await primary] == ["C-PRIMARY"]
+    assert [c["id"] for c in associated] == ["C-ASSOC"]
+    assert nova.count("/contracts") == 2
@@ -0,0 +1,55 @@
+"""Backoff-ul de autentificare se aplică și login-urilor eșuate."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.vreaulanova.api import ResultStatus
+from custom_components.vreaulanova.const import AUTH_FAILURE_LIMIT
+
+from .conftest import FakeNova
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_failing_login_is_backed_off(client, nova: FakeNova) -> None:
+    client._access_token = None  # sesiune expirată
+    nova.scripted["/accounts/login/client"] = [(0, 401)] * (AUTH_FAILURE_LIMIT + 5)
+
+    for _ in range(AUTH_FAILURE_LIMIT + 5):
+        result = await client.async_call(client.async_get_balances)
+        assert result.status is ResultStatus.AUTH_ERROR
+
+    # După limită, request-urile nu mai declanșează login-uri
+    assert nova.count("/accounts/login/client") == 1 + AUTH_FAILURE_LIMIT
+    assert nova.count("/balances") == 0
+    assert client.diagnostics()["token"]["auth_blocked_for"] > 0
+
+
+async def test_token_manager_respects_auth_backoff(client, nova: FakeNova) -> None:
+    client._token_expires_in = 0  # reînnoire scadentă
+    client._auth_blocked_until = time.monotonic() + 60
+
+    manager = asyncio.create_task(client.async_run_token_manager())
+    await asyncio.sleep(0.05)
+    manager.cancel()
+
+    # Cât timp autentificarea e suspendată, managerul nu încearcă login-uri
+    assert nova.count("/accounts/login/client") == 1
+
+
+async def test_backend_outage_does_not_trigger_auth_backoff(client, nova: FakeNova) -> None:
+    client._access_token = None  # sesiune expirată
+    nova.scripted["/accounts/login/client"] = [(0, 503)] * 50
+
+    for _ in range(AUTH_FAILURE_LIMIT + 2):
+        result = await client.async_call(client.async_get_balances)
+        assert result.status is ResultStatus.AUTH_ERROR
+
+    # 503 la login e indisponibilitate, nu credențiale respinse
+    token = client.diagnostics()["token"]
+    assert token["auth_failures"] == 0
+    assert token["auth_blocked_for"] == 0
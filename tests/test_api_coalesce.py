@@ -0,0 +1,55 @@
+"""Single-flight: GET-ul comun urcă la prioritatea celui mai prioritar apelant."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.vreaulanova.api import (
+    _PRIORITY,
+    AdaptiveLimiter,
+    NovaApiClient,
+    RequestPriority,
+)
+
+from .conftest import FakeNova, FakeSession
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _call_as(priority: RequestPriority, call):
+    _PRIORITY.set(priority)
+    return await call()
+
+
+async def test_interactive_caller_promotes_backfill_flight(nova: FakeNova) -> None:
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=1)
+    client = NovaApiClient(FakeSession(nova), "user@example.com", "secret", limiter=limiter)
+    assert await client.async_login()
+
+    await limiter.acquire()  # fereastra plină
+    contracts = asyncio.create_task(
+        _call_as(RequestPriority.REFRESH, client.async_get_contracts)
+    )
+    backfill = asyncio.create_task(
+        _call_as(RequestPriority.BACKFILL, client.async_get_balances)
+    )
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["queue_depth_by_priority"] == {
+        "interactive": 0, "refresh": 1, "backfill": 1,
+    }
+
+    # Apelantul interactiv se alătură GET-ului de fundal și nu mai așteaptă
+    # după refresh-ul din coadă
+    balances = await asyncio.wait_for(
+        _call_as(RequestPriority.INTERACTIVE, client.async_get_balances), 1
+    )
+    limiter.release()
+    await asyncio.gather(contracts, backfill)
+
+    assert balances["balance"] == 10
+    assert nova.count("/balances") == 1
+    paths = [path for _m, path, _v in nova.requests]
+    assert paths.index("/balances") < paths.index("/contracts")
+    assert client.diagnostics()["dispatcher"]["promotions"] == 1
@@ -0,0 +1,45 @@
+"""Hedging: opțional (implicit oprit); un 5xx rapid nu câștigă cursa."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.vreaulanova import api as api_module
+from custom_components.vreaulanova.api import NovaApiClient
+
+from .conftest import FakeNova, FakeSession
+
+pytestmark = pytest.mark.asyncio
+
+
+def _slow_samples(client: NovaApiClient) -> None:
+    for _ in range(api_module.LATENCY_MIN_SAMPLES):
+        client._latency.record("/balances", 0.01)
+
+
+async def test_hedging_is_off_by_default(client, nova: FakeNova, monkeypatch) -> None:
+    monkeypatch.setattr(api_module, "HEDGE_MIN_DELAY", 0.01)
+    _slow_samples(client)
+    nova.delays["/balances"] = 0.05
+
+    assert (await client.async_get_balances())["balance"] == 10
+    assert nova.count("/balances") == 1
+    assert client.diagnostics()["hedging"]["fired"] == 0
+
+
+async def test_fast_server_error_does_not_win(nova: FakeNova, monkeypatch) -> None:
+    monkeypatch.setattr(api_module, "HEDGE_MIN_DELAY", 0.01)
+    client = NovaApiClient(
+        FakeSession(nova), "user@example.com", "secret", use_hedging=True
+    )
+    assert await client.async_login()
+    _slow_samples(client)
+    # Primul request e lent dar reușește; copia (hedge) pică imediat cu 503
+    nova.scripted["/balances"] = [(0.1, 200), (0, 503)]
+
+    balances = await client.async_get_balances()
+
+    assert balances["balance"] == 10
+    assert nova.count("/balances") == 2  # fără reîncercare după 503-ul copiei
+    hedging = client.diagnostics()["hedging"]
+    assert (hedging["fired"], hedging["won"]) == (1, 0)
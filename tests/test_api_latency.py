@@ -0,0 +1,17 @@
+"""Latențele citirilor delta nu coboară timeout-ul descărcărilor complete."""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_delta_reads_use_separate_latency_key(client) -> None:
+    await client.async_get_self_readings(updated_after="2026-01-01T00:00:00Z")
+    assert "/self-readings#delta" in client.export_latency()
+    assert "/self-readings" not in client.export_latency()
+
+    await client.async_get_self_readings()
+    assert len(client.export_latency()["/self-readings"]) == 1
+    assert len(client.export_latency()["/self-readings#delta"]) == 1
@@ -0,0 +1,120 @@
+"""Citirea în flux: delimitarea documentelor și decodorul comun."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.vreaulanova.api import (
+    ConnectionStats,
+    NovaApiClient,
+    ResultStatus,
+    _DocsStreamParser,
+)
+from custom_components.vreaulanova.const import URL_PAYMENTS
+
+from .conftest import PRIMARY, FakeNova, FakeSession
+
+_DOCS = [
+    {"id": 1, "note": 'ghilimele \\" și ]} în text', "items": [{"a": [1, 2]}]},
+    {"id": 2, "note": "diacritice: ăîșțâ", "amount": 12.5},
+    {"id": 3, "nested": {"deep": {"deeper": []}}, "flag": None},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 4096])
+def test_parser_splits_docs_across_chunks(chunk_size: int) -> None:
+    body = json.dumps(
+        {"docs": _DOCS, "hasNextPage": True, "nextPage": 2}, ensure_ascii=False
+    ).encode()
+    parser = _DocsStreamParser()
+    raw_docs = []
+    for start in range(0, len(body), chunk_size):
+        raw_docs.extend(parser.feed(body[start:start + chunk_size]))
+
+    assert [json.loads(raw) for raw in raw_docs] == _DOCS
+    assert json.loads(parser.close()) == {"docs": [], "hasNextPage": True, "nextPage": 2}
+
+
+def test_parser_accepts_top_level_list_and_rejects_truncation() -> None:
+    parser = _DocsStreamParser()
+    assert [json.loads(raw) for raw in parser.feed(b' [{"id": 1}, 2, "x"]')] == [
+        {"id": 1}, 2, "x",
+    ]
+    assert parser.close() == b"{}"
+
+    truncated = _DocsStreamParser()
+    truncated.feed(b'{"docs": [{"id": 1}, {"id"')
+    with pytest.raises(ValueError):
+        truncated.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_uses_shared_decoder(nova: FakeNova) -> None:
+    nova.docs["/payments"] = _DOCS
+    decoded: list[bytes] = []
+
+    def _loads(body: bytes):
+        decoded.append(body)
+        return json.loads(body)
+
+    stats = ConnectionStats()
+    client = NovaApiClient(
+        FakeSession(nova), "user@example.com", "secret",
+        connection_stats=stats, json_loads=_loads,
+    )
+    assert await client.async_login()
+    decoded.clear()
+
+    assert await client.async_get_payments() == _DOCS
+    # Un apel per document + unul pentru metadatele paginii
+    assert len(decoded) == len(_DOCS) + 1
+    endpoint_stats = client.diagnostics()["decode"]["endpoints"]["/payments"]
+    assert endpoint_stats["count"] == len(_DOCS) + 1
+    # Faza decode a paginii intră în trace o singură dată, pe contul vizualizat
+    assert stats.phase_stats()["decode"]["by_crm"][PRIMARY]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_rejection_after_first_page_restarts_unfiltered(
+    client, nova: FakeNova
+) -> None:
+    nova.docs["/payments"] = [{"id": i, "date": "2026-01-01"} for i in range(5)]
+    # Pagina 2: 400 cu proiecție, 400 și fără ea → vina e a filtrului
+    nova.scripted["/payments"] = [(0, 200), (0, 400), (0, 400)]
+    docs: list[dict] = []
+
+    result = await client.async_call(
+        client.async_stream_docs,
+        URL_PAYMENTS,
+        docs.append,
+        page_size=2,
+        where={"date": {"greater_than_equal": "2026-01-01"}},
+        on_restart=docs.clear,
+    )
+
+    assert result.usable and result.data is True
+    assert [doc["id"] for doc in docs] == [0, 1, 2, 3, 4]
+    assert client.diagnostics()["where_disabled"] == ["/payments"]
+    assert client.diagnostics()["projection_disabled"] == []
+
+
+@pytest.mark.asyncio
+async def test_stream_rejection_without_restart_is_a_failure(
+    client, nova: FakeNova
+) -> None:
+    nova.docs["/payments"] = [{"id": i} for i in range(5)]
+    nova.scripted["/payments"] = [(0, 200), (0, 400), (0, 400)]
+    docs: list[dict] = []
+
+    result = await client.async_call(
+        client.async_stream_docs,
+        URL_PAYMENTS,
+        docs.append,
+        page_size=2,
+        where={"date": {"greater_than_equal": "2026-01-01"}},
+    )
+
+    assert result.status is ResultStatus.TRANSIENT_ERROR
+    assert client.diagnostics()["where_disabled"] == ["/payments"]
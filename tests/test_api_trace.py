@@ -0,0 +1,29 @@
+"""Fazele request-urilor etichetate cu contul vizualizat pe server."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.vreaulanova.api import ConnectionStats, NovaApiClient
+
+from .conftest import ASSOCIATED, PRIMARY, FakeNova, FakeSession
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_phases_tagged_by_viewed_crm(nova: FakeNova) -> None:
+    stats = ConnectionStats()
+    client = NovaApiClient(
+        FakeSession(nova), "user@example.com", "secret", connection_stats=stats
+    )
+    assert await client.async_login()
+
+    await client.async_get_balances()
+    await client.async_switch_account(nova.account(ASSOCIATED, "Asociat"))
+    await client.async_get_balances()
+
+    phases = stats.phase_stats()
+    for phase in ("transfer", "decode"):
+        by_crm = phases[phase]["by_crm"]
+        assert {PRIMARY, ASSOCIATED} <= set(by_crm)
+        assert by_crm[ASSOCIATED]["count"] >= 1
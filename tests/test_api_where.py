@@ -0,0 +1,50 @@
+"""Filtrele where: facturile nefiltrate, fallback la 400."""
+
+from __future__ import annotations
+
+import pytest
+
+from .conftest import FakeNova
+
+pytestmark = pytest.mark.asyncio
+
+
+def _where_sent(nova: FakeNova, path: str) -> list[bool]:
+    return [
+        any(key.startswith("where[") for key in params)
+        for p, params in nova.queries
+        if p == path
+    ]
+
+
+async def test_invoices_are_fetched_unfiltered(client, nova: FakeNova) -> None:
+    await client.async_get_invoices()
+    assert _where_sent(nova, "/invoices") == [False]
+
+
+async def test_rejected_where_retries_without_filter(client, nova: FakeNova) -> None:
+    nova.reject_where.add("/payments")
+
+    result = await client.async_call(
+        client.async_get_payments, updated_after="2026-01-01T00:00:00Z"
+    )
+    assert result.usable
+    # 400 cu proiecție, 400 și fără ea → vina e a filtrului: se repetă fără
+    # where; proiecția rămâne activă, următorul apel pleacă direct fără filtru
+    await client.async_get_payments(updated_after="2026-01-01T00:00:00Z")
+    assert _where_sent(nova, "/payments") == [True, True, False, False]
+    assert client.diagnostics()["where_disabled"] == ["/payments"]
+    assert client.diagnostics()["projection_disabled"] == []
+
+
+async def test_rejected_where_in_stream_retries_without_filter(
+    client, nova: FakeNova
+) -> None:
+    nova.reject_where.add("/payments")
+
+    result = await client.async_call(client.async_get_payments, year=2026)
+    assert result.usable
+    await client.async_get_payments(year=2026)
+    # Ca în _get: întâi fără proiecție, apoi fără where (proiecția revine)
+    assert _where_sent(nova, "/payments") == [True, True, False, False]
+    assert client.diagnostics()["projection_disabled"] == []
@@ -0,0 +1,76 @@
+"""Trimiterea indexului în timpul unui refresh multi-cont."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.vreaulanova.const import TOKEN_PROACTIVE_REFRESH
+from custom_components.vreaulanova.coordinator import NovaCoordinator
+
+from .conftest import ASSOCIATED, ASSOCIATED_2, PRIMARY, FakeNova
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _refresh_paused_on(nova: FakeNova, coordinator: NovaCoordinator, crm: str):
+    """Pornește un refresh și așteaptă până când serverul vizualizează `crm`."""
+    nova.delays["/balances"] = 0.05
+    refresh = asyncio.create_task(coordinator._async_update_data())
+    while nova.viewed != crm:
+        await asyncio.sleep(0.005)
+    return refresh
+
+
+@pytest.mark.parametrize("target", [PRIMARY, ASSOCIATED_2])
+async def test_press_interrupting_associated_loop(hass, client, nova, target) -> None:
+    coordinator = NovaCoordinator(hass, client, SimpleNamespace(entry_id="entry1234"))
+    refresh = await _refresh_paused_on(nova, coordinator, ASSOCIATED)
+
+    # Refresh-ul cedează poarta la punctul sigur de după contul asociat
+    result = await client.async_submit_self_reading_for(target, {"newIndex": 42})
+    data = await refresh
+
+    assert result
+    assert nova.self_readings_added == [(target, {"newIndex": 42})]
+    assert client.crm_viewed_account == PRIMARY
+    assert nova.viewed == PRIMARY
+    # Fiecare cont a fost citit cu serverul pe contul respectiv
+    assert [viewed for _m, path, viewed in nova.requests if path == "/balances"] == [
+        PRIMARY, ASSOCIATED, ASSOCIATED_2,
+    ]
+    balances = {crm: acct["balance"]["total"] for crm, acct in data["accounts_data"].items()}
+    assert balances == {PRIMARY: 10, ASSOCIATED: 99, ASSOCIATED_2: 7}
+    assert client.diagnostics()["dispatcher"]["preemptions"] == 1
+
+
+async def test_press_not_sent_when_switch_fails(client, nova) -> None:
+    assert await client.async_submit_self_reading_for("9999999", {"newIndex": 1}) is None
+    assert nova.self_readings_added == []
+
+
+async def test_token_renewal_waits_for_associated_read(hass, client, nova) -> None:
+    coordinator = NovaCoordinator(hass, client, SimpleNamespace(entry_id="entry1234"))
+    # Token încă valid, dar în fereastra de reînnoire proactivă
+    client._token_expires_in = TOKEN_PROACTIVE_REFRESH - 60
+    assert client.is_token_valid()
+    refresh = await _refresh_paused_on(nova, coordinator, ASSOCIATED)
+
+    renewed = asyncio.Event()
+    manager = asyncio.create_task(client.async_run_token_manager(renewed.set))
+    data = await refresh
+    await asyncio.wait_for(renewed.wait(), 1)
+    manager.cancel()
+
+    # Login-ul cu parola (fallback) a plecat abia după citirea conturilor
+    paths = [path for _m, path, _v in nova.requests]
+    logins = [i for i, path in enumerate(paths) if path == "/accounts/login/client"]
+    last_balance = max(i for i, path in enumerate(paths) if path == "/balances")
+    assert len(logins) == 2 and logins[-1] > last_balance
+    assert [viewed for _m, path, viewed in nova.requests if path == "/balances"] == [
+        PRIMARY, ASSOCIATED, ASSOCIATED_2,
+    ]
+    balances = {crm: acct["balance"]["total"] for crm, acct in data["accounts_data"].items()}
+    assert balances == {PRIMARY: 10, ASSOCIATED: 99, ASSOCIATED_2: 7}
@@ -0,0 +1,32 @@
+"""Combinarea documentelor delta cu lista din ciclul anterior."""
+
+from __future__ import annotations
+
+from custom_components.vreaulanova.coordinator import _DELTA_KEYS, _merge_delta
+
+KEYS = _DELTA_KEYS["self_readings"]
+
+
+def test_edited_doc_keeps_its_position() -> None:
+    previous = [{"id": 3, "month": "march"}, {"id": 2}, {"id": 1, "month": "january"}]
+    edited = {"id": 1, "month": "january", "consumption": 5}
+
+    merged = _merge_delta(previous, [edited], KEYS)
+
+    assert [doc["id"] for doc in merged] == [3, 2, 1]
+    assert merged[0]["month"] == "march"  # „cel mai recent” nu se schimbă
+    assert merged[2] is edited
+
+
+def test_new_docs_come_first_in_server_order() -> None:
+    previous = [{"id": 2}, {"id": 1}]
+
+    merged = _merge_delta(previous, [{"id": 4}, {"id": 3}, {"id": 1, "x": 1}], KEYS)
+
+    assert [doc["id"] for doc in merged] == [4, 3, 2, 1]
+    assert merged[3] == {"id": 1, "x": 1}
+
+
+def test_invoices_are_not_delta_synced() -> None:
+    # /invoices întoarce wrapper-e {invoices[], balance} — updatedAt nu e per factură
+    assert "invoices" not in _DELTA_KEYS
@@ -0,0 +1,29 @@
+"""Persistarea sesiunii: Store-ul se scrie doar când token-ul se schimbă."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.vreaulanova.coordinator import NovaCoordinator
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_persist_token_only_when_changed(hass, client, monkeypatch) -> None:
+    coordinator = NovaCoordinator(hass, client, SimpleNamespace(entry_id="entry1234"))
+    saves: list[float] = []
+    monkeypatch.setattr(
+        coordinator._session_store,
+        "async_delay_save",
+        lambda _data, delay: saves.append(delay),
+    )
+
+    coordinator._persist_token()
+    coordinator._persist_token()
+    assert len(saves) == 1
+
+    client._access_token = "tok-rotit"
+    coordinator._persist_token()
+    assert len(saves) == 2
@@ -0,0 +1,74 @@
+"""GraphQL: forma wrapper a facturilor și fallback-ul pe REST."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.vreaulanova.api import NovaApiClient
+from custom_components.vreaulanova.coordinator import NovaCoordinator
+
+from .conftest import ASSOCIATED, ASSOCIATED_2, PRIMARY, FakeNova, FakeSession
+
+pytestmark = pytest.mark.asyncio
+
+
+def _page(docs: list) -> dict:
+    return {"docs": docs, "hasNextPage": False}
+
+
+async def _graphql_client(nova: FakeNova) -> NovaApiClient:
+    api = NovaApiClient(FakeSession(nova), "user@example.com", "secret", use_graphql=True)
+    assert await api.async_login()
+    return api
+
+
+async def test_bundle_invoices_keep_wrapper_shape(nova: FakeNova) -> None:
+    nova.graphql = {
+        "data": {
+            "metering_points": _page([]),
+            "invoices": _page([
+                {
+                    "invoices": [{"invoiceId": "F1", "issueDate": "2026-02-01"}],
+                    "balance": {"total": 120, "prosumer": 0},
+                },
+                {"invoices": [{"invoiceId": "F0", "issueDate": "2025-12-01"}]},
+            ]),
+            "balances": _page([{"balance": 120, "prosumerBalance": 0}]),
+            "self_readings": _page([]),
+            "contracts": _page([]),
+        }
+    }
+    client = await _graphql_client(nova)
+
+    bundle = await client.async_get_account_bundle()
+
+    assert "invoices { invoiceId" in nova.graphql_queries[0]
+    assert [inv["invoiceId"] for inv in bundle["invoices"]["invoices"]] == ["F1", "F0"]
+    assert bundle["invoices"]["balance"] == {"total": 120, "prosumer": 0}
+
+
+async def test_rest_fallback_reuses_prefetched_results(hass, nova: FakeNova) -> None:
+    client = await _graphql_client(nova)
+    coordinator = NovaCoordinator(hass, client, SimpleNamespace(entry_id="entry1234"))
+
+    await coordinator._async_update_data()
+
+    assert len(nova.graphql_queries) == 1  # respins (404) → REST pentru toate conturile
+    for path in ("/metering-points/self-readings", "/metering-points"):
+        viewed = [crm for _m, p, crm in nova.requests if p == path]
+        assert sorted(viewed) == [PRIMARY, ASSOCIATED, ASSOCIATED_2]
+
+
+async def test_resolver_errors_keep_graphql_enabled(nova: FakeNova) -> None:
+    nova.graphql = {"data": None, "errors": [{"message": "You are not allowed"}]}
+    client = await _graphql_client(nova)
+
+    assert await client.async_get_account_bundle() is None
+    assert client.graphql_enabled  # doar ciclul curent trece pe REST
+
+    nova.graphql = {"errors": [{"message": 'Cannot query field "invoices"'}]}
+    nova.graphql_status = 400
+    assert await client.async_get_account_bundle() is None
+    assert not client.graphql_enabled